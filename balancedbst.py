@@ -1,5 +1,60 @@
 import random
-from typing import Optional, List, Tuple
+from array import array
+from typing import Dict, Iterable, Optional, List, Set, Tuple
+
+# SplitMix64 state for treap priorities: integer priorities compare faster than
+# floats, and one add + two multiplies is cheaper than a Mersenne Twister call
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+_rng_state = random.getrandbits(64)
+
+
+SEARCH_CACHE_LIMIT = 4096  # Max memoized search results per tree
+# "Nothing passed / nothing cached" sentinel: None is a legitimate node value
+# and a legitimate "not found" search result, so it can't play this role
+_MISSING = object()
+
+
+def _next_priority() -> int:
+    """Next 64-bit SplitMix64 output (collisions need ~2^32 draws to show up)"""
+    global _rng_state
+    _rng_state = (_rng_state + 0x9E3779B97F4A7C15) & _MASK64
+    z = _rng_state
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+class BatchOperations:
+    """
+    Batch entry points shared by all the trees.
+    
+    Calling tree.insert(key) in a loop pays the method lookup on every
+    iteration; these bind the method once and run the whole batch. Trees
+    with a genuinely faster bulk path (Treap's pre-drawn priorities,
+    AVLTreeSoA's column-level search) override the relevant method.
+    """
+    
+    def insert_many(self, keys: Iterable[int], values: Optional[Iterable] = None) -> None:
+        """Insert every key (paired with values, if given)"""
+        insert = self.insert
+        if values is None:
+            for key in keys:
+                insert(key)
+        else:
+            for key, value in zip(keys, values):
+                insert(key, value)
+    
+    def search_many(self, keys: Iterable[int]) -> list:
+        """Search every key, returning the results in the same order"""
+        search = self.search
+        return [search(key) for key in keys]
+    
+    def delete_many(self, keys: Iterable[int]) -> None:
+        """Delete every key (missing keys are ignored, as with delete)"""
+        delete = self.delete
+        for key in keys:
+            delete(key)
+
 
 class TreapNode:
     """
@@ -12,14 +67,17 @@ class TreapNode:
     The random priorities ensure expected O(log n) height with high probability.
     It's like having a perfectly balanced tree without the complexity of rotations!
     """
-    def __init__(self, key: int, value=None):
+    __slots__ = ("key", "value", "priority", "left", "right")
+    
+    def __init__(self, key: int, value=_MISSING, priority: Optional[int] = None):
         self.key = key
-        self.value = value if value is not None else key
-        self.priority = random.random()  # Random priority is the magic sauce
+        self.value = key if value is _MISSING else value
+        # Random priority is the magic sauce (callers may pre-draw it in bulk)
+        self.priority = priority if priority is not None else _next_priority()
         self.left: Optional['TreapNode'] = None
         self.right: Optional['TreapNode'] = None
 
-class Treap:
+class Treap(BatchOperations):
     """
     Treap: The probabilistically balanced BST that's surprisingly simple.
     
@@ -32,6 +90,7 @@ class Treap:
     
     def __init__(self):
         self.root: Optional[TreapNode] = None
+        self._free_path: List[TreapNode] = []  # Reused insertion path buffer
     
     def _rotate_right(self, node: TreapNode) -> TreapNode:
         """
@@ -69,48 +128,135 @@ class Treap:
         right_child.left = node
         return right_child
     
-    def insert(self, key: int, value=None) -> None:
-        """Insert a key-value pair. The magic happens in the recursive helper."""
-        self.root = self._insert_recursive(self.root, key, value)
+    def insert(self, key: int, value=_MISSING) -> None:
+        """Insert a key-value pair. The magic happens in the iterative helper."""
+        self._insert(key, value)
+    
+    @classmethod
+    def from_sorted(cls, keys: List[int], values: Optional[List] = None) -> 'Treap':
+        """
+        Build a treap from strictly increasing keys in O(n) - no rotations.
+        
+        The midpoint of each range becomes the subtree root, giving a perfectly
+        balanced shape. Priorities are still random draws, just handed out
+        largest-first in level order so every parent outranks its children.
+        Unsorted input should be sorted first: sorted() + from_sorted still
+        beats n individual inserts.
+        """
+        treap = cls()
+        nodes: List[TreapNode] = []
+        
+        def build(lo: int, hi: int) -> Optional[TreapNode]:
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            node = TreapNode(keys[mid], values[mid] if values is not None else _MISSING, 0)
+            node.left = build(lo, mid)
+            node.right = build(mid + 1, hi)
+            return node
+        
+        treap.root = build(0, len(keys))
+        
+        # Level-order walk: hand out priorities in decreasing order
+        priorities = sorted((_next_priority() for _ in range(len(keys))), reverse=True)
+        if treap.root is not None:
+            nodes.append(treap.root)
+        for i, priority in enumerate(priorities):
+            node = nodes[i]
+            node.priority = priority
+            if node.left is not None:
+                nodes.append(node.left)
+            if node.right is not None:
+                nodes.append(node.right)
+        return treap
+    
+    def insert_many(self, keys: Iterable[int], values: Optional[Iterable] = None) -> None:
+        """Batch insert via bulk_insert, so the priorities are drawn up front"""
+        self.bulk_insert(list(keys), list(values) if values is not None else None)
+    
+    def bulk_insert(self, keys: List[int], values: Optional[List] = None,
+                    seed: Optional[int] = None) -> None:
+        """
+        Insert many keys at once with all priorities drawn up front.
+        
+        Drawing the priorities in one tight loop from a private RNG keeps the
+        per-insert cost down to a list read, and passing a seed makes the
+        resulting tree shape reproducible.
+        """
+        rng = random.Random(seed)
+        draw = rng.getrandbits
+        priorities = [draw(64) for _ in range(len(keys))]
+        if values is None:
+            values = [_MISSING] * len(keys)
+        for key, value, priority in zip(keys, values, priorities):
+            self._insert(key, value, priority)
     
-    def _insert_recursive(self, node: Optional[TreapNode], key: int, value) -> TreapNode:
+    def _insert(self, key: int, value, priority: Optional[int] = None) -> None:
         """
         The heart of treap insertion - it's like regular BST insert, but with a twist!
         
-        1. Insert like normal BST (following key ordering)
-        2. Check if heap property is violated (child has higher priority than parent)
-        3. If violated, rotate to fix it
+        1. Walk down like a normal BST insert, remembering the path
+        2. Hang the new node off the last node on the path
+        3. Walk the path back up, rotating the new node above its parent
+           for as long as its priority beats the parent's (heap property)
         
-        The beauty: rotations happen naturally based on random priorities!
+        Doing this with an explicit path instead of recursion keeps deep
+        (unlucky) trees from paying a Python frame per level.
         """
-        # Base case: create new node
-        if node is None:
-            return TreapNode(key, value)
+        path = self._free_path
+        node = self.root
+        while node is not None:
+            # Hot comparisons first; the duplicate-key case is the cold path
+            node_key = node.key
+            path.append(node)
+            if key < node_key:
+                node = node.left
+            elif key > node_key:
+                node = node.right
+            else:
+                # Key already exists, update value
+                node.value = key if value is _MISSING else value
+                path.clear()
+                return
         
-        # Standard BST insertion logic
-        if key < node.key:
-            node.left = self._insert_recursive(node.left, key, value)
-            # Heap property check: if left child has higher priority, rotate right
-            if node.left.priority > node.priority:
-                node = self._rotate_right(node)
-        elif key > node.key:
-            node.right = self._insert_recursive(node.right, key, value)
-            # Heap property check: if right child has higher priority, rotate left
-            if node.right.priority > node.priority:
-                node = self._rotate_left(node)
+        child = TreapNode(key, value, priority)
+        if not path:
+            self.root = child
+            return
+        
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = child
         else:
-            # Key already exists, update value
-            node.value = value if value is not None else key
+            parent.right = child
         
-        return node
+        # Bubble the new node up while it violates the heap property
+        while path:
+            parent = path.pop()
+            if child.priority <= parent.priority:
+                break
+            if parent.left is child:
+                self._rotate_right(parent)
+            else:
+                self._rotate_left(parent)
+            if path:
+                grandparent = path[-1]
+                if grandparent.left is parent:
+                    grandparent.left = child
+                else:
+                    grandparent.right = child
+            else:
+                self.root = child
+        path.clear()
     
     def search(self, key: int) -> Optional[TreapNode]:
         """Standard BST search - no rotations needed here!"""
         current = self.root
-        while current:
-            if key == current.key:
+        while current is not None:
+            current_key = current.key  # One attribute read per level
+            if key == current_key:
                 return current
-            elif key < current.key:
+            elif key < current_key:
                 current = current.left
             else:
                 current = current.right
@@ -163,13 +309,24 @@ class SplayNode:
     
     Think of it like organizing your desk - frequently used items naturally end up on top!
     """
-    def __init__(self, key: int, value=None):
+    __slots__ = ("key", "value", "left", "right")
+    
+    def __init__(self, key: int, value=_MISSING):
         self.key = key
-        self.value = value if value is not None else key
+        self.value = key if value is _MISSING else value
         self.left: Optional['SplayNode'] = None
         self.right: Optional['SplayNode'] = None
 
-class SplayTree:
+class _SplayHeader:
+    """Sentinel whose children hold the left/right trees during a top-down splay"""
+    __slots__ = ("left", "right")
+    
+    def __init__(self):
+        self.left: Optional[SplayNode] = None
+        self.right: Optional[SplayNode] = None
+
+
+class SplayTree(BatchOperations):
     """
     Splay Tree: The self-adjusting BST that adapts to your access patterns.
     
@@ -181,8 +338,18 @@ class SplayTree:
     5. Competitive with other balanced trees for many real-world scenarios
     """
     
-    def __init__(self):
+    def __init__(self, adaptive: bool = False, splay_threshold: int = 4,
+                 max_tracked_keys: int = 4096):
         self.root: Optional[SplayNode] = None
+        self._header = _SplayHeader()  # Scratch root for top-down splaying
+        # Adaptive search: only splay keys that keep coming back
+        self.adaptive = adaptive
+        self.splay_threshold = splay_threshold
+        self.max_tracked_keys = max_tracked_keys
+        self._freq: Dict[int, int] = {}  # key -> hits since last splay (LRU order)
+        # Keys known to be absent. Only misses are memoized: a hit still has
+        # to splay, and the node that comes back changes with every splay.
+        self._absent_keys: Set[int] = set()
     
     def _splay(self, node: Optional[SplayNode], key: int) -> Optional[SplayNode]:
         """
@@ -194,48 +361,63 @@ class SplayTree:
         3. Zig-Zag: key is left child of right child (or vice versa)
         
         The key insight: these cases minimize the tree height over many operations!
+        
+        This is Sleator-Tarjan top-down splaying: on the way down we peel nodes
+        off into a "left tree" (everything smaller than key) and a "right tree"
+        (everything larger), doing the zig-zig rotation inline. Once we hit the
+        key (or fall off the tree) the three pieces are reassembled. One pass,
+        no recursion, so even a degenerate linked-list tree is fine.
+        
+        If key is missing, its predecessor or successor ends up at the root.
         """
-        if node is None or node.key == key:
-            return node
+        if node is None:
+            return None
         
-        # Key is in left subtree
-        if key < node.key:
-            if node.left is None:
-                return node  # Key not found
-            
-            # Zig-Zig case (left-left)
-            if key < node.left.key:
-                # Recursively splay in left-left subtree
-                node.left.left = self._splay(node.left.left, key)
-                # First rotation
-                node = self._rotate_right(node)
-            # Zig-Zag case (left-right)
-            elif key > node.left.key:
-                # Recursively splay in left-right subtree
-                node.left.right = self._splay(node.left.right, key)
-                # Rotate left child left if needed
-                if node.left.right:
-                    node.left = self._rotate_left(node.left)
-            
-            # Second rotation (or first if Zig case)
-            return self._rotate_right(node) if node.left else node
+        # header.right collects the left tree, header.left the right tree
+        header = self._header
+        header.left = header.right = None
+        left = right = header
         
-        # Key is in right subtree (mirror of above)
-        else:
-            if node.right is None:
-                return node  # Key not found
-            
-            # Zig-Zag case (right-left)
-            if key < node.right.key:
-                node.right.left = self._splay(node.right.left, key)
-                if node.right.left:
-                    node.right = self._rotate_right(node.right)
-            # Zig-Zig case (right-right)
-            elif key > node.right.key:
-                node.right.right = self._splay(node.right.right, key)
-                node = self._rotate_left(node)
-            
-            return self._rotate_left(node) if node.right else node
+        while True:
+            if key < node.key:
+                child = node.left
+                if child is None:
+                    break
+                if key < child.key:
+                    # Zig-Zig: rotate right first
+                    node.left = child.right
+                    child.right = node
+                    node = child
+                    if node.left is None:
+                        break
+                # Link right: node and its right subtree are all > key
+                right.left = node
+                right = node
+                node = node.left
+            elif key > node.key:
+                child = node.right
+                if child is None:
+                    break
+                if key > child.key:
+                    # Zig-Zig: rotate left first
+                    node.right = child.left
+                    child.left = node
+                    node = child
+                    if node.right is None:
+                        break
+                # Link left: node and its left subtree are all < key
+                left.right = node
+                left = node
+                node = node.right
+            else:
+                break
+        
+        # Reassemble: left tree + node + right tree
+        left.right = node.left
+        right.left = node.right
+        node.left = header.right
+        node.right = header.left
+        return node
     
     def _rotate_right(self, node: SplayNode) -> SplayNode:
         """Right rotation - same as treap, but used for splaying"""
@@ -257,11 +439,46 @@ class SplayTree:
         
         Even if we're just searching, we reorganize the tree to make
         this key (and nearby keys) faster to access next time.
+        
+        In adaptive mode a key only gets splayed once it has been looked up
+        splay_threshold times; until then the search is a pure read. Uniform
+        workloads stop paying for restructuring, skewed ones still get their
+        hot keys pulled up to the root.
         """
+        if key in self._absent_keys:
+            return None
+        if self.adaptive:
+            freq = self._freq
+            count = freq.pop(key, 0) + 1  # pop + reinsert keeps LRU order
+            if count < self.splay_threshold:
+                freq[key] = count
+                if len(freq) > self.max_tracked_keys:
+                    del freq[next(iter(freq))]  # Evict least recently searched
+                return self._remember(key, self.search_readonly(key))
+        
         self.root = self._splay(self.root, key)
-        return self.root if self.root and self.root.key == key else None
+        return self._remember(key, self.root if self.root and self.root.key == key else None)
+    
+    def _remember(self, key: int, result: Optional[SplayNode]) -> Optional[SplayNode]:
+        """Record a miss in the absent-key cache, then pass the result through"""
+        if result is None and len(self._absent_keys) < SEARCH_CACHE_LIMIT:
+            self._absent_keys.add(key)
+        return result
+    
+    def search_readonly(self, key: int) -> Optional[SplayNode]:
+        """Plain BST lookup - no splaying, the tree is left untouched"""
+        current = self.root
+        while current is not None:
+            current_key = current.key  # One attribute read per level
+            if key == current_key:
+                return current
+            elif key < current_key:
+                current = current.left
+            else:
+                current = current.right
+        return None
     
-    def insert(self, key: int, value=None) -> None:
+    def insert(self, key: int, value=_MISSING) -> None:
         """
         Insert with splaying - brings the new key to the root.
         
@@ -270,6 +487,7 @@ class SplayTree:
         2. If key exists, update it
         3. If not, split the tree and make key the new root
         """
+        self._absent_keys.discard(key)  # Only inserts can turn a miss into a hit
         if self.root is None:
             self.root = SplayNode(key, value)
             return
@@ -278,7 +496,7 @@ class SplayTree:
         
         if self.root.key == key:
             # Key already exists, update value
-            self.root.value = value if value is not None else key
+            self.root.value = key if value is _MISSING else value
             return
         
         # Key doesn't exist, create new root
@@ -337,14 +555,17 @@ class AVLNode:
     
     This makes them ideal when you need guaranteed O(log n) performance.
     """
-    def __init__(self, key: int, value=None):
+    # Hot fields first: searches only ever touch key/left/right
+    __slots__ = ("key", "left", "right", "height", "value")
+    
+    def __init__(self, key: int, value=_MISSING):
         self.key = key
-        self.value = value if value is not None else key
+        self.value = key if value is _MISSING else value
         self.left: Optional['AVLNode'] = None
         self.right: Optional['AVLNode'] = None
         self.height = 1  # Height of this subtree (leaf = 1)
 
-class AVLTree:
+class AVLTree(BatchOperations):
     """
     AVL Tree: The original self-balancing BST with guaranteed balance.
     
@@ -359,23 +580,16 @@ class AVLTree:
     
     def __init__(self):
         self.root: Optional[AVLNode] = None
+        self._free_path: List[AVLNode] = []  # Reused insertion path buffer
+        self._search_cache: Dict[int, Optional[AVLNode]] = {}  # key -> search result
     
-    def _get_height(self, node: Optional[AVLNode]) -> int:
-        """Get height of a node (0 for None, avoiding null pointer issues)"""
-        return node.height if node else 0
-    
-    def _get_balance(self, node: Optional[AVLNode]) -> int:
-        """
-        Calculate balance factor: height(left) - height(right)
-        
-        Balance factor tells us if the tree is left-heavy (+), right-heavy (-), or balanced (0)
-        AVL property: balance factor must be in {-1, 0, 1}
-        """
-        return self._get_height(node.left) - self._get_height(node.right) if node else 0
-    
-    def _update_height(self, node: AVLNode) -> None:
-        """Update height based on children's heights"""
-        node.height = 1 + max(self._get_height(node.left), self._get_height(node.right))
+    # Heights are read inline throughout ("child.height if child is not None
+    # else 0") rather than through helper methods: these run on every level of
+    # every insert/delete, and a bound-method call costs more than the read.
+    #
+    # Balance factor = height(left) - height(right). It tells us if the tree is
+    # left-heavy (+), right-heavy (-), or balanced (0).
+    # AVL property: balance factor must be in {-1, 0, 1}
     
     def _rotate_right(self, y: AVLNode) -> AVLNode:
         """
@@ -393,12 +607,17 @@ class AVLTree:
        Heights are recalculated to maintain AVL property
         """
         x = y.left
-        y.left = x.right
+        b = x.right
+        y.left = b
         x.right = y
         
         # Update heights (order matters - update y first, then x)
-        self._update_height(y)
-        self._update_height(x)
+        a, c = x.left, y.right
+        hb = b.height if b is not None else 0
+        hc = c.height if c is not None else 0
+        hy = y.height = 1 + (hb if hb > hc else hc)
+        ha = a.height if a is not None else 0
+        x.height = 1 + (ha if ha > hy else hy)
         
         return x
     
@@ -409,27 +628,62 @@ class AVLTree:
         Used when right subtree is too heavy (balance factor < -1)
         """
         y = x.right
-        x.right = y.left
+        b = y.left
+        x.right = b
         y.left = x
         
         # Update heights (order matters - update x first, then y)
-        self._update_height(x)
-        self._update_height(y)
+        a, c = x.left, y.right
+        ha = a.height if a is not None else 0
+        hb = b.height if b is not None else 0
+        hx = x.height = 1 + (ha if ha > hb else hb)
+        hc = c.height if c is not None else 0
+        y.height = 1 + (hx if hx > hc else hc)
         
         return y
     
-    def insert(self, key: int, value=None) -> None:
+    @classmethod
+    def from_sorted(cls, keys: List[int], values: Optional[List] = None) -> 'AVLTree':
+        """
+        Build an AVL tree from strictly increasing keys in O(n) - no rotations.
+        
+        Taking the midpoint of each range as the subtree root yields subtrees
+        whose sizes differ by at most one, which is well within the AVL rule.
+        Unsorted input should be sorted first: sorted() + from_sorted still
+        beats n individual inserts.
+        """
+        tree = cls()
+        
+        def build(lo: int, hi: int) -> Optional[AVLNode]:
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            node = AVLNode(keys[mid], values[mid] if values is not None else _MISSING)
+            left = node.left = build(lo, mid)
+            right = node.right = build(mid + 1, hi)
+            lh = left.height if left is not None else 0
+            rh = right.height if right is not None else 0
+            node.height = 1 + (lh if lh > rh else rh)
+            return node
+        
+        tree.root = build(0, len(keys))
+        return tree
+    
+    def insert(self, key: int, value=_MISSING) -> None:
         """Insert a key-value pair maintaining AVL property"""
-        self.root = self._insert_recursive(self.root, key, value)
+        # Rotations never move a key to another node, so only this key's
+        # cached answer (a miss, or the node itself) can go stale
+        self._search_cache.pop(key, None)
+        self._insert(key, value)
     
-    def _insert_recursive(self, node: Optional[AVLNode], key: int, value) -> AVLNode:
+    def _insert(self, key: int, value) -> None:
         """
         AVL insertion with rebalancing.
         
         The algorithm:
-        1. Insert like normal BST
-        2. Update height of current node
-        3. Check balance factor
+        1. Walk down like normal BST, remembering the path
+        2. Attach the new leaf
+        3. Walk the path back up, updating heights and checking balance factors
         4. If unbalanced, determine rotation type and rotate
         
         Four rotation cases:
@@ -437,56 +691,102 @@ class AVLTree:
         - Right Right: left rotation  
         - Left Right: left rotation on left child, then right rotation
         - Right Left: right rotation on right child, then left rotation
+        
+        The explicit path replaces one Python frame per level of recursion.
         """
-        # Step 1: Standard BST insertion
-        if node is None:
-            return AVLNode(key, value)
+        # Step 1: Standard BST descent
+        path = self._free_path
+        node = self.root
+        while node is not None:
+            # Hot comparisons first; the duplicate-key case is the cold path
+            node_key = node.key
+            path.append(node)
+            if key < node_key:
+                node = node.left
+            elif key > node_key:
+                node = node.right
+            else:
+                # Key already exists, update value
+                node.value = key if value is _MISSING else value
+                path.clear()
+                return
         
-        if key < node.key:
-            node.left = self._insert_recursive(node.left, key, value)
-        elif key > node.key:
-            node.right = self._insert_recursive(node.right, key, value)
+        # Step 2: Attach the new leaf
+        leaf = AVLNode(key, value)
+        if not path:
+            self.root = leaf
+            return
+        if key < path[-1].key:
+            path[-1].left = leaf
         else:
-            # Key already exists, update value
-            node.value = value if value is not None else key
-            return node
-        
-        # Step 2: Update height
-        self._update_height(node)
-        
-        # Step 3: Get balance factor
-        balance = self._get_balance(node)
-        
-        # Step 4: If unbalanced, there are 4 cases
-        
-        # Left Left Case (left subtree is left-heavy)
-        if balance > 1 and key < node.left.key:
-            return self._rotate_right(node)
-        
-        # Right Right Case (right subtree is right-heavy)
-        if balance < -1 and key > node.right.key:
-            return self._rotate_left(node)
-        
-        # Left Right Case (left subtree is right-heavy)
-        if balance > 1 and key > node.left.key:
-            node.left = self._rotate_left(node.left)
-            return self._rotate_right(node)
+            path[-1].right = leaf
         
-        # Right Left Case (right subtree is left-heavy)
-        if balance < -1 and key < node.right.key:
-            node.right = self._rotate_right(node.right)
-            return self._rotate_left(node)
-        
-        # No imbalance, return unchanged node
-        return node
+        # Step 3: Retrace towards the root
+        while path:
+            node = path.pop()
+            left, right = node.left, node.right
+            lh = left.height if left is not None else 0
+            rh = right.height if right is not None else 0
+            balance = lh - rh
+            
+            # Step 4: If unbalanced, there are 4 cases
+            if balance > 1:
+                # Left Right Case (left subtree is right-heavy)
+                if key > node.left.key:
+                    node.left = self._rotate_left(node.left)
+                # Left Left Case (left subtree is left-heavy)
+                subtree = self._rotate_right(node)
+            elif balance < -1:
+                # Right Left Case (right subtree is left-heavy)
+                if key < node.right.key:
+                    node.right = self._rotate_right(node.right)
+                # Right Right Case (right subtree is right-heavy)
+                subtree = self._rotate_left(node)
+            else:
+                new_height = 1 + (lh if lh > rh else rh)
+                if new_height == node.height:
+                    # Subtree didn't grow: nothing above can have changed
+                    break
+                node.height = new_height
+                continue
+            
+            # Hook the rotated subtree back into its parent
+            if path:
+                parent = path[-1]
+                if parent.left is node:
+                    parent.left = subtree
+                else:
+                    parent.right = subtree
+            else:
+                self.root = subtree
+            # A rotation after insert restores the subtree's old height
+            break
+        path.clear()
     
     def search(self, key: int) -> Optional[AVLNode]:
-        """Standard BST search - no rotations needed, just traverse"""
+        """
+        Standard BST search - no rotations needed, just traverse.
+        
+        Results are memoized until that key is inserted or deleted, so repeated
+        lookups of the same key cost a dict probe instead of a root-to-leaf walk.
+        """
+        cache = self._search_cache
+        result = cache.get(key, _MISSING)
+        if result is not _MISSING:
+            return result
+        result = self._search_uncached(key)
+        if len(cache) < SEARCH_CACHE_LIMIT:
+            cache[key] = result
+        return result
+    
+    def _search_uncached(self, key: int) -> Optional[AVLNode]:
+        """The actual root-to-leaf walk behind search"""
         current = self.root
-        while current:
-            if key == current.key:
+        while current is not None:
+            current_key = current.key  # One attribute read per level
+            if key == current_key:
                 return current
-            elif key < current.key:
+            elif key < current_key:
                 current = current.left
             else:
                 current = current.right
@@ -494,6 +794,9 @@ class AVLTree:
     
     def delete(self, key: int) -> None:
         """Delete a key maintaining AVL property"""
+        # Nodes keep their keys through deletion (the successor node itself
+        # is moved up), so only the deleted key's cached answer goes stale
+        self._search_cache.pop(key, None)
         self.root = self._delete_recursive(self.root, key)
     
     def _delete_recursive(self, node: Optional[AVLNode], key: int) -> Optional[AVLNode]:
@@ -512,9 +815,17 @@ class AVLTree:
             return node
         
         if key < node.key:
-            node.left = self._delete_recursive(node.left, key)
+            child = node.left
+            old_height = child.height if child is not None else 0
+            child = node.left = self._delete_recursive(child, key)
+            if (child.height if child is not None else 0) == old_height:
+                return node  # Subtree didn't shrink: no rebalancing needed
         elif key > node.key:
-            node.right = self._delete_recursive(node.right, key)
+            child = node.right
+            old_height = child.height if child is not None else 0
+            child = node.right = self._delete_recursive(child, key)
+            if (child.height if child is not None else 0) == old_height:
+                return node  # Subtree didn't shrink: no rebalancing needed
         else:
             # Node to be deleted found
             if node.left is None:
@@ -522,44 +833,355 @@ class AVLTree:
             elif node.right is None:
                 return node.left
             else:
-                # Node with two children: get inorder successor
-                successor = self._find_min(node.right)
-                node.key = successor.key
-                node.value = successor.value
-                node.right = self._delete_recursive(node.right, successor.key)
+                # Node with two children: unhook the inorder successor in the
+                # same pass that finds it, then put it where node used to be
+                successor, new_right = self._extract_min(node.right)
+                successor.left = node.left
+                successor.right = new_right
+                node = successor
+        
+        # Steps 2-4: Update height, check balance, rotate if needed
+        return self._rebalance(node)
+    
+    def _rebalance(self, node: AVLNode) -> AVLNode:
+        """
+        Restore the AVL property at node after one of its subtrees shrank.
         
+        Returns the root of the (possibly rotated) subtree.
+        """
         # Step 2: Update height
-        self._update_height(node)
+        left, right = node.left, node.right
+        lh = left.height if left is not None else 0
+        rh = right.height if right is not None else 0
+        node.height = 1 + (lh if lh > rh else rh)
         
         # Step 3: Get balance factor
-        balance = self._get_balance(node)
+        balance = lh - rh
         
         # Step 4: If unbalanced, there are 4 cases (same as insertion)
-        
-        # Left Left Case
-        if balance > 1 and self._get_balance(node.left) >= 0:
-            return self._rotate_right(node)
-        
-        # Left Right Case
-        if balance > 1 and self._get_balance(node.left) < 0:
-            node.left = self._rotate_left(node.left)
+        if balance > 1:
+            inner, outer = left.right, left.left
+            # Left Right Case (left child leans right), else Left Left Case
+            hi = inner.height if inner is not None else 0
+            ho = outer.height if outer is not None else 0
+            if hi > ho:
+                node.left = self._rotate_left(left)
             return self._rotate_right(node)
         
-        # Right Right Case
-        if balance < -1 and self._get_balance(node.right) <= 0:
-            return self._rotate_left(node)
-        
-        # Right Left Case
-        if balance < -1 and self._get_balance(node.right) > 0:
-            node.right = self._rotate_right(node.right)
+        if balance < -1:
+            inner, outer = right.left, right.right
+            # Right Left Case (right child leans left), else Right Right Case
+            hi = inner.height if inner is not None else 0
+            ho = outer.height if outer is not None else 0
+            if hi > ho:
+                node.right = self._rotate_right(right)
             return self._rotate_left(node)
         
         return node
     
-    def _find_min(self, node: AVLNode) -> AVLNode:
-        """Find the minimum key in a subtree (leftmost node)"""
-        while node.left:
+    def _extract_min(self, node: AVLNode) -> Tuple[AVLNode, Optional[AVLNode]]:
+        """
+        Unlink the minimum (leftmost) node of a subtree in a single descent.
+        
+        Returns (min_node, new_subtree_root). The path down is kept on a stack
+        so the subtree can be rebalanced on the way back up - no second search
+        for the successor's key.
+        """
+        path = []
+        while node.left is not None:
+            path.append(node)
             node = node.left
+        
+        subtree = node.right  # The min node has no left child
+        while path:
+            parent = path.pop()
+            parent.left = subtree
+            subtree = self._rebalance(parent)
+        return node, subtree
+
+
+NIL = -1  # "Null pointer" for the array-backed tree
+
+
+def _soa_search(keys: array, left: array, right: array, root: int, key: int) -> int:
+    """
+    Plain BST descent over parallel key/child arrays.
+    
+    Kept as a free function of the raw columns so any tree laid out this way
+    can share it. Returns the node id holding key, or NIL.
+    """
+    current = root
+    while current != NIL:
+        current_key = keys[current]
+        if key == current_key:
+            return current
+        current = left[current] if key < current_key else right[current]
+    return NIL
+
+
+class AVLTreeSoA(BatchOperations):
+    """
+    AVL Tree stored as a struct of arrays instead of a web of node objects.
+    
+    Every node is just an integer id indexing into parallel columns:
+    - keys:   int64 keys
+    - left:   int32 id of the left child (NIL if none)
+    - right:  int32 id of the right child (NIL if none)
+    - height: int8 subtree height (an AVL tree of 2^31 nodes is < 64 tall)
+    - values: the payloads (arbitrary Python objects, so a plain list)
+    
+    A search only walks keys/left/right, which are compact typed arrays rather
+    than pointers to scattered heap objects. Deleted ids go on a free list and
+    get recycled by the next insert. Same rotations, same balance rules as
+    AVLTree - only the storage changes.
+    """
+    
+    def __init__(self, capacity: int = 1024):
+        capacity = max(capacity, 1)
+        self.keys = array('q', [0]) * capacity
+        self.left = array('i', [NIL]) * capacity
+        self.right = array('i', [NIL]) * capacity
+        self.height = array('b', [1]) * capacity
+        self.values: List = [None] * capacity
+        self.root = NIL
+        self.size = 0  # Number of live nodes
+        self._next_id = 0  # High-water mark of ids ever handed out
+        self._free: List[int] = []  # Ids released by delete, reused first
+        self._free_path: List[int] = []  # Reused insertion path buffer
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def _grow(self) -> None:
+        """Double every column (amortized O(1) per insert, like list.append)"""
+        capacity = len(self.keys)
+        self.keys += array('q', [0]) * capacity
+        self.left += array('i', [NIL]) * capacity
+        self.right += array('i', [NIL]) * capacity
+        self.height += array('b', [1]) * capacity
+        self.values += [None] * capacity
+    
+    def _new_node(self, key: int, value) -> int:
+        """Hand out a fresh node id, recycling deleted ones first"""
+        if self._free:
+            node = self._free.pop()
+        else:
+            node = self._next_id
+            if node == len(self.keys):
+                self._grow()
+            self._next_id += 1
+        self.keys[node] = key
+        self.left[node] = NIL
+        self.right[node] = NIL
+        self.height[node] = 1
+        self.values[node] = key if value is _MISSING else value
+        self.size += 1
+        return node
+    
+    def _free_node(self, node: int) -> None:
+        """Return an id to the free list (and drop the payload reference)"""
+        self.values[node] = None
+        self._free.append(node)
+        self.size -= 1
+    
+    def _get_height(self, node: int) -> int:
+        """Height of a node id (0 for NIL - careful, array[-1] is the last slot!)"""
+        return self.height[node] if node != NIL else 0
+    
+    def _get_balance(self, node: int) -> int:
+        """Balance factor: height(left) - height(right)"""
+        if node == NIL:
+            return 0
+        return self._get_height(self.left[node]) - self._get_height(self.right[node])
+    
+    def _update_height(self, node: int) -> None:
+        """Update height based on children's heights"""
+        self.height[node] = 1 + max(self._get_height(self.left[node]),
+                                    self._get_height(self.right[node]))
+    
+    def _rotate_right(self, y: int) -> int:
+        """Right rotation - same picture as AVLTree._rotate_right, on ids"""
+        left, right = self.left, self.right
+        x = left[y]
+        left[y] = right[x]
+        right[x] = y
+        self._update_height(y)
+        self._update_height(x)
+        return x
+    
+    def _rotate_left(self, x: int) -> int:
+        """Left rotation - mirror of the above"""
+        left, right = self.left, self.right
+        y = right[x]
+        right[x] = left[y]
+        left[y] = x
+        self._update_height(x)
+        self._update_height(y)
+        return y
+    
+    def search(self, key: int) -> int:
+        """Return the node id holding key (read its payload via values[id]), or NIL"""
+        return _soa_search(self.keys, self.left, self.right, self.root, key)
+    
+    def search_many(self, keys: List[int]) -> List[int]:
+        """
+        Look up a batch of keys, returning one node id (or NIL) per key.
+        
+        The columns and root are fetched once for the whole batch, and the
+        results are plain ints, so a frozen tree can hand them to any consumer
+        without touching node objects.
+        """
+        tree_keys, left, right, root = self.keys, self.left, self.right, self.root
+        return [_soa_search(tree_keys, left, right, root, key) for key in keys]
+    
+    def insert(self, key: int, value=_MISSING) -> None:
+        """Insert a key-value pair maintaining AVL property (see AVLTree._insert)"""
+        keys, left, right = self.keys, self.left, self.right
+        path = self._free_path
+        node = self.root
+        while node != NIL:
+            # Hot comparisons first; the duplicate-key case is the cold path
+            node_key = keys[node]
+            path.append(node)
+            if key < node_key:
+                node = left[node]
+            elif key > node_key:
+                node = right[node]
+            else:
+                # Key already exists, update value
+                self.values[node] = key if value is _MISSING else value
+                path.clear()
+                return
+        
+        leaf = self._new_node(key, value)
+        if not path:
+            self.root = leaf
+            return
+        # _new_node may have grown (i.e. replaced) the columns
+        keys, left, right = self.keys, self.left, self.right
+        if key < keys[path[-1]]:
+            left[path[-1]] = leaf
+        else:
+            right[path[-1]] = leaf
+        
+        while path:
+            node = path.pop()
+            self._update_height(node)
+            balance = self._get_balance(node)
+            
+            if balance > 1:
+                if key > keys[left[node]]:
+                    left[node] = self._rotate_left(left[node])
+                subtree = self._rotate_right(node)
+            elif balance < -1:
+                if key < keys[right[node]]:
+                    right[node] = self._rotate_right(right[node])
+                subtree = self._rotate_left(node)
+            else:
+                continue
+            
+            if path:
+                parent = path[-1]
+                if left[parent] == node:
+                    left[parent] = subtree
+                else:
+                    right[parent] = subtree
+            else:
+                self.root = subtree
+    
+    def freeze_veb(self) -> None:
+        """
+        Renumber the nodes into van Emde Boas order for a read-mostly phase.
+        
+        After a bulk load the ids follow insertion order, so a root-to-leaf
+        search hops all over the columns. The vEB layout cuts the tree at
+        half its height, stores the top piece first, then each bottom piece
+        one after another, recursively. Any root-to-leaf path then crosses
+        only O(log n / log B) cache lines of size B, without having to know B.
+        
+        The tree stays a normal AVLTreeSoA afterwards (free slots are
+        compacted away); later inserts simply append behind the frozen block.
+        """
+        if self.root == NIL:
+            return
+        order: List[int] = []
+        self._veb_order(self.root, self.height[self.root], order)
+        
+        n = len(order)
+        new_id = {old: new for new, old in enumerate(order)}
+        new_id[NIL] = NIL
+        old_keys, old_left, old_right = self.keys, self.left, self.right
+        old_height, old_values = self.height, self.values
+        
+        self.keys = array('q', (old_keys[old] for old in order))
+        self.left = array('i', (new_id[old_left[old]] for old in order))
+        self.right = array('i', (new_id[old_right[old]] for old in order))
+        self.height = array('b', (old_height[old] for old in order))
+        self.values = [old_values[old] for old in order]
+        self.root = new_id[self.root]
+        self._next_id = n
+        self._free.clear()
+    
+    def _veb_order(self, node: int, h: int, order: List[int]) -> None:
+        """Append the ids of the top h levels under node in vEB order"""
+        if node == NIL or h <= 0:
+            return
+        if h == 1:
+            order.append(node)
+            return
+        
+        # Top half first (the ceiling goes on top)...
+        top = (h + 1) // 2
+        self._veb_order(node, top, order)
+        
+        # ...then every bottom subtree hanging exactly `top` levels down
+        left, right = self.left, self.right
+        frontier = [node]
+        for _ in range(top):
+            frontier = [child for parent in frontier
+                        for child in (left[parent], right[parent]) if child != NIL]
+        for subtree in frontier:
+            self._veb_order(subtree, h - top, order)
+    
+    def delete(self, key: int) -> None:
+        """Delete a key maintaining AVL property"""
+        self.root = self._delete_recursive(self.root, key)
+    
+    def _delete_recursive(self, node: int, key: int) -> int:
+        """Same case analysis as AVLTree._delete_recursive, on ids"""
+        if node == NIL:
+            return node
+        
+        keys, left, right = self.keys, self.left, self.right
+        if key < keys[node]:
+            left[node] = self._delete_recursive(left[node], key)
+        elif key > keys[node]:
+            right[node] = self._delete_recursive(right[node], key)
+        else:
+            if left[node] == NIL or right[node] == NIL:
+                child = left[node] if left[node] != NIL else right[node]
+                self._free_node(node)
+                return child
+            # Two children: copy the inorder successor in, then delete it below
+            successor = right[node]
+            while left[successor] != NIL:
+                successor = left[successor]
+            keys[node] = keys[successor]
+            self.values[node] = self.values[successor]
+            right[node] = self._delete_recursive(right[node], keys[successor])
+        
+        self._update_height(node)
+        balance = self._get_balance(node)
+        
+        if balance > 1:
+            if self._get_balance(left[node]) < 0:
+                left[node] = self._rotate_left(left[node])
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._get_balance(right[node]) > 0:
+                right[node] = self._rotate_right(right[node])
+            return self._rotate_left(node)
+        
         return node
 
 
@@ -581,21 +1203,19 @@ def demonstrate_trees():
     print(f"\n📝 Inserting keys: {test_keys}")
     
     # Insert into all trees
-    for key in test_keys:
-        treap.insert(key)
-        splay.insert(key)
-        avl.insert(key)
+    trees = (treap, splay, avl)
+    for tree in trees:
+        tree.insert_many(test_keys)
     
     print("\n🔍 Testing search operations:")
     
     # Test searches
     search_keys = [25, 45, 100]  # Mix of existing and non-existing keys
     
-    for key in search_keys:
-        treap_result = treap.search(key)
-        splay_result = splay.search(key)  # This will splay the tree!
-        avl_result = avl.search(key)
-        
+    # (The splay tree's searches will splay the tree!)
+    results = [tree.search_many(search_keys) for tree in trees]
+    
+    for key, treap_result, splay_result, avl_result in zip(search_keys, *results):
         print(f"Searching for {key}:")
         print(f"  Treap: {'Found' if treap_result else 'Not found'}")
         print(f"  Splay: {'Found' if splay_result else 'Not found'}")
@@ -606,17 +1226,14 @@ def demonstrate_trees():
     # Test deletions
     delete_keys = [20, 50]
     
-    for key in delete_keys:
-        print(f"Deleting {key} from all trees...")
-        treap.delete(key)
-        splay.delete(key)
-        avl.delete(key)
-        
-        # Verify deletion
-        treap_check = treap.search(key)
-        splay_check = splay.search(key)
-        avl_check = avl.search(key)
-        
+    print(f"Deleting {delete_keys} from all trees...")
+    for tree in trees:
+        tree.delete_many(delete_keys)
+    
+    # Verify deletion
+    checks = [tree.search_many(delete_keys) for tree in trees]
+    
+    for key, treap_check, splay_check, avl_check in zip(delete_keys, *checks):
         if not treap_check and not splay_check and not avl_check:
             print(f"  ✅ {key} successfully deleted from all trees")
         else:
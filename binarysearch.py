@@ -1,26 +1,17 @@
+from bisect import bisect_left, bisect_right
+
+
 # Standard Binary Search (find index of target in sorted array, or -1 if not found)
 def binary_search(arr, target):
-    left, right = 0, len(arr) - 1
-    while left <= right:
-        mid = (left + right) // 2
-        if arr[mid] == target:
-            return mid
-        elif arr[mid] < target:
-            left = mid + 1
-        else:
-            right = mid - 1
+    idx = bisect_left(arr, target)
+    if idx < len(arr) and arr[idx] == target:
+        return idx
     return -1
 
 
 # Find the leftmost (first) occurrence of target in sorted array
 def binary_search_left(arr, target):
-    left, right = 0, len(arr)
-    while left < right:
-        mid = (left + right) // 2
-        if arr[mid] < target:
-            left = mid + 1
-        else:
-            right = mid
+    left = bisect_left(arr, target)
     if left < len(arr) and arr[left] == target:
         return left
     return -1
@@ -28,13 +19,7 @@ def binary_search_left(arr, target):
 
 # Find the rightmost (last) occurrence of target in sorted array
 def binary_search_right(arr, target):
-    left, right = 0, len(arr)
-    while left < right:
-        mid = (left + right) // 2
-        if arr[mid] <= target:
-            left = mid + 1
-        else:
-            right = mid
+    left = bisect_right(arr, target)
     if left > 0 and arr[left - 1] == target:
         return left - 1
     return -1
@@ -42,26 +27,80 @@ def binary_search_right(arr, target):
 
 # Find the first element greater than or equal to target
 def lower_bound(arr, target):
-    left, right = 0, len(arr)
-    while left < right:
-        mid = (left + right) // 2
-        if arr[mid] < target:
-            left = mid + 1
-        else:
-            right = mid
-    return left  # index where target can be inserted
+    return bisect_left(arr, target)  # index where target can be inserted
 
 
 # Find the first element strictly greater than target
 def upper_bound(arr, target):
-    left, right = 0, len(arr)
-    while left < right:
-        mid = (left + right) // 2
-        if arr[mid] <= target:
-            left = mid + 1
-        else:
-            right = mid
-    return left
+    return bisect_right(arr, target)
+
+
+# Branchless lower bound: the probe result is folded into the index instead of
+# steering an if/else, so every search runs exactly log2(n) + 1 comparisons
+def lower_bound_branchless(arr, target):
+    n = len(arr)
+    if n == 0:
+        return 0
+    step = 1 << (n.bit_length() - 1)  # largest power of two <= n
+    base = (arr[step - 1] < target) * (n - step)
+    while step > 1:
+        step >>= 1
+        base += (arr[base + step - 1] < target) * step
+    return base + (arr[base] < target)
+
+
+# Branchless upper bound: same walk as above with <= as the probe
+def upper_bound_branchless(arr, target):
+    n = len(arr)
+    if n == 0:
+        return 0
+    step = 1 << (n.bit_length() - 1)
+    base = (arr[step - 1] <= target) * (n - step)
+    while step > 1:
+        step >>= 1
+        base += (arr[base + step - 1] <= target) * step
+    return base + (arr[base] <= target)
+
+
+# Permute a sorted array into Eytzinger (BFS / implicit heap) order: slot k has
+# children 2k+1 and 2k+2, so the first few probes of every search land close
+# together in memory instead of jumping n/2, n/4, ... apart
+def to_eytzinger(arr):
+    n = len(arr)
+    layout = [None] * n
+    i = 0
+    stack = []
+    k = 1  # 1-based heap index of the node being visited in-order
+    while stack or k <= n:
+        while k <= n:
+            stack.append(k)
+            k = 2 * k
+        k = stack.pop()
+        layout[k - 1] = arr[i]
+        i += 1
+        k = 2 * k + 1
+    return layout
+
+
+# Lower bound on an Eytzinger layout: returns the slot of the first element
+# >= target, or len(layout) if every element is smaller
+def eytzinger_lower_bound(layout, target):
+    n = len(layout)
+    k = 1
+    while k <= n:
+        k = 2 * k + (layout[k - 1] < target)
+    # Undo the trailing "went right" moves plus the final "went left" one
+    k >>= (~k & (k + 1)).bit_length()
+    return k - 1 if k else n
+
+
+# Run binary_search for many targets against the same sorted array
+def binary_search_batch(arr, targets):
+    n = len(arr)
+    targets = list(targets)
+    search = bisect_left  # local lookup keeps the per-target loop tight
+    indices = [search(arr, t) for t in targets]
+    return [i if i < n and arr[i] == t else -1 for i, t in zip(indices, targets)]
 
 
 # Binary search on answer space (example: sqrt of x)
@@ -86,4 +125,10 @@ if __name__ == "__main__":
     print("Rightmost occurrence of 2:", binary_search_right(arr, 2))
     print("Lower bound for 2:", lower_bound(arr, 2))
     print("Upper bound for 2:", upper_bound(arr, 2))
+    print("Branchless lower/upper bound for 2:",
+          lower_bound_branchless(arr, 2), upper_bound_branchless(arr, 2))
+    layout = to_eytzinger(arr)
+    print("Eytzinger layout:", layout)
+    print("Eytzinger lower bound for 3:", layout[eytzinger_lower_bound(layout, 3)])
+    print("Batch search for [2, 4, 6]:", binary_search_batch(arr, [2, 4, 6]))
     print("Square root of 10 approx:", binary_search_sqrt(10))
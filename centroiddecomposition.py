@@ -1,5 +1,3 @@
-from collections import defaultdict, deque
-
 class CentroidDecomposition:
     """
     Centroid Decomposition implementation for efficient path counting in trees.
@@ -15,32 +13,78 @@ class CentroidDecomposition:
         # n is the number of nodes (assuming 0-indexed)
         self.n = n
         # Adjacency list representation of our tree
-        self.graph = defaultdict(list)
+        self.graph = [[] for _ in range(n)]
         # Keep track of which nodes we've already processed as centroids
-        self.removed = [False] * n
+        # (one byte per node: 0 = still in play, 1 = removed)
+        self.removed = bytearray(n)
         # Store subtree sizes for centroid finding
         self.subtree_size = [0] * n
+        # Flat (CSR) copy of the adjacency for the hot traversals:
+        # neighbors of v are adj_nodes[adj_start[v]:adj_start[v + 1]]
+        self.adj_start = None
+        self.adj_nodes = None
+        # Reusable BFS scratch: dist[v] == -1 means "not reached yet". Only
+        # the entries touched by the previous BFS are reset, not all n.
+        self.dist = [-1] * n
+        self._visited = []
+        # BFS order of the component from the last get_subtree_size call
+        self._order = []
     
     def add_edge(self, u, v):
         """Add an undirected edge between nodes u and v"""
         self.graph[u].append(v)
         self.graph[v].append(u)
+        self.adj_start = None  # CSR is stale, rebuild it on next use
+    
+    def _build_csr(self):
+        """
+        Flatten the adjacency lists into two arrays (compressed sparse rows).
+        Built once before decomposing instead of chasing per-node lists.
+        """
+        adj_start = [0] * (self.n + 1)
+        adj_nodes = []
+        for v in range(self.n):
+            adj_nodes.extend(self.graph[v])
+            adj_start[v + 1] = len(adj_nodes)
+        self.adj_start = adj_start
+        self.adj_nodes = adj_nodes
     
-    def get_subtree_size(self, node, parent):
+    def get_subtree_size(self, node, parent=-1):
         """
         Calculate the size of subtree rooted at 'node'.
         We need this to find the centroid efficiently.
+        
+        Done iteratively so long paths don't hit the recursion limit:
+        first list the nodes in BFS order (parents before children),
+        then sweep that list backwards adding each size into its parent.
         """
-        self.subtree_size[node] = 1  # Count the node itself
+        if self.adj_start is None:
+            self._build_csr()
+        adj_start, adj_nodes = self.adj_start, self.adj_nodes
+        removed, subtree_size = self.removed, self.subtree_size
+        
+        order = [node]
+        parents = [parent]
+        i = 0
+        while i < len(order):
+            v = order[i]
+            p = parents[i]
+            i += 1
+            subtree_size[v] = 1  # Count the node itself
+            for k in range(adj_start[v], adj_start[v + 1]):
+                u = adj_nodes[k]
+                if u != p and not removed[u]:
+                    order.append(u)
+                    parents.append(v)
         
-        # Visit all children and add their subtree sizes
-        for neighbor in self.graph[node]:
-            if neighbor != parent and not self.removed[neighbor]:
-                self.subtree_size[node] += self.get_subtree_size(neighbor, node)
+        # Children come after their parents, so a reverse sweep is a post-order
+        for i in range(len(order) - 1, 0, -1):
+            subtree_size[parents[i]] += subtree_size[order[i]]
         
-        return self.subtree_size[node]
+        self._order = order  # Kept for find_centroid
+        return subtree_size[node]
     
-    def find_centroid(self, node, parent, tree_size):
+    def find_centroid(self, root, tree_size):
         """
         Find the centroid of the current tree component.
         
@@ -48,52 +92,67 @@ class CentroidDecomposition:
         component has size > tree_size/2.
         
         Why is this useful? It guarantees balanced decomposition!
-        """
-        # Check if current node can be a centroid
-        is_centroid = True
-        
-        for neighbor in self.graph[node]:
-            if neighbor != parent and not self.removed[neighbor]:
-                # If any subtree is too large, this can't be centroid
-                if self.subtree_size[neighbor] > tree_size // 2:
-                    is_centroid = False
-                    # Recursively search in the large subtree
-                    return self.find_centroid(neighbor, node, tree_size)
         
-        # Also check the "upward" component (parent side)
-        if parent != -1:
-            upward_size = tree_size - self.subtree_size[node]
-            if upward_size > tree_size // 2:
-                is_centroid = False
+        With sizes measured from root, the nodes whose subtree is bigger
+        than tree_size/2 form a single path down from root (two disjoint
+        subtrees can't both hold more than half the nodes). The deepest node
+        on that path has no heavy child, and everything above it is less
+        than half, so it's the centroid. The BFS order that get_subtree_size
+        just built lists deeper nodes later, so one backwards scan finds it.
+        """
+        order = self._order
+        if not order or order[0] != root:
+            # Sizes weren't measured from this root yet
+            tree_size = self.get_subtree_size(root)
+            order = self._order
         
-        # If we reach here and is_centroid is True, we found our centroid!
-        return node if is_centroid else -1
+        subtree_size = self.subtree_size
+        half = tree_size // 2
+        for i in range(len(order) - 1, -1, -1):
+            if subtree_size[order[i]] > half:
+                return order[i]
     
     def get_distances(self, start, max_dist=None):
         """
         BFS to get distances from start node to all reachable nodes.
         This is used to find all paths of specific lengths through the centroid.
         
-        Returns: dictionary mapping node -> distance from start
+        Returns: list of reached nodes in BFS order; self.dist[v] holds the
+        distance of each of them (valid until the next get_distances call)
         """
-        distances = {}
-        queue = deque([(start, 0)])  # (node, distance)
-        distances[start] = 0
+        if self.adj_start is None:
+            self._build_csr()
+        adj_start, adj_nodes = self.adj_start, self.adj_nodes
+        removed, dist = self.removed, self.dist
+        
+        # Forget the previous BFS in O(its size)
+        for node in self._visited:
+            dist[node] = -1
         
-        while queue:
-            node, dist = queue.popleft()
+        # The queue never drops anything, so it doubles as the visited list
+        queue = self._visited = [start]
+        dist[start] = 0
+        head = 0
+        
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            d = dist[node]
             
-            # If we have a max distance limit and exceeded it, skip
-            if max_dist is not None and dist >= max_dist:
-                continue
+            # BFS pops nodes in nondecreasing distance order, so once we
+            # reach the limit every node still queued is at the limit too:
+            # nothing left to expand, stop right here
+            if max_dist is not None and d >= max_dist:
+                break
             
             # Explore all unremoved neighbors
-            for neighbor in self.graph[node]:
-                if not self.removed[neighbor] and neighbor not in distances:
-                    distances[neighbor] = dist + 1
-                    queue.append((neighbor, dist + 1))
+            for k in range(adj_start[node], adj_start[node + 1]):
+                neighbor = adj_nodes[k]
+                if dist[neighbor] == -1 and not removed[neighbor]:
+                    dist[neighbor] = d + 1
+                    queue.append(neighbor)
         
-        return distances
+        return queue
     
     def count_paths_with_length(self, target_length):
         """
@@ -103,8 +162,18 @@ class CentroidDecomposition:
         """
         self.target_length = target_length
         self.total_paths = 0
+        if target_length <= 0:
+            # No centroid work needed: every single vertex is a path of length
+            # 0, and nothing is shorter (this also keeps _freq non-empty)
+            if target_length == 0:
+                self.total_paths = self.n
+            return self.total_paths
+        
+        # Distance -> count scratch for _count_paths_through_centroid,
+        # allocated once and cleared entry by entry after each centroid
+        self._freq = [0] * (target_length + 1)
         
-        # Start the recursive decomposition from any node (let's use 0)
+        # Start the decomposition from any node (let's use 0)
         self._decompose(0)
         
         return self.total_paths
@@ -115,86 +184,84 @@ class CentroidDecomposition:
         
         1. Find the centroid of current component
         2. Count all paths through this centroid
-        3. Remove centroid and recursively solve subproblems
-        """
-        # First, calculate subtree sizes for centroid finding
-        tree_size = self.get_subtree_size(start_node, -1)
-        
-        # Find the centroid of this component
-        centroid = self.find_centroid(start_node, -1, tree_size)
+        3. Remove centroid and queue up each remaining component
         
-        # Count paths passing through this centroid
-        self._count_paths_through_centroid(centroid)
-        
-        # Mark centroid as removed (so it won't be considered in subproblems)
-        self.removed[centroid] = True
+        Components wait on an explicit stack instead of the call stack; the
+        order they are handled in doesn't matter, since they're independent.
+        """
+        removed = self.removed
+        graph = self.graph
+        pending = [start_node]
         
-        # Recursively decompose each remaining component
-        for neighbor in self.graph[centroid]:
-            if not self.removed[neighbor]:
-                # Each neighbor represents a separate component now
-                self._decompose(neighbor)
+        while pending:
+            component = pending.pop()
+            
+            # First, calculate subtree sizes for centroid finding
+            tree_size = self.get_subtree_size(component, -1)
+            
+            # Find the centroid of this component
+            centroid = self.find_centroid(component, tree_size)
+            
+            # Mark centroid as removed (so it won't be considered in subproblems).
+            # Doing it first also keeps each subtree's BFS from leaking back
+            # through the centroid into its sibling subtrees.
+            removed[centroid] = 1
+            
+            # Count paths passing through this centroid
+            self._count_paths_through_centroid(centroid)
+            
+            # Each remaining neighbor represents a separate component now
+            for neighbor in graph[centroid]:
+                if not removed[neighbor]:
+                    pending.append(neighbor)
     
     def _count_paths_through_centroid(self, centroid):
         """
         Count all paths of target length that pass through the centroid.
         
         Key insight: Any path through centroid goes from some node in 
-        subtree A to some node in subtree B (where A ≠ B).
+        subtree A to some node in subtree B (where A ≠ B), or from the
+        centroid itself to some node.
         
         We use the principle: 
         - Count paths from centroid to all nodes in each subtree
-        - For target length k, combine paths of length i from subtree A 
-          with paths of length (k-i) from subtree B
-        """
-        # Get all distances from centroid (this includes all subtrees)
-        all_distances = self.get_distances(centroid, self.target_length)
+        - Keep a running count freq[d] of nodes at distance d in the subtrees
+          processed so far (freq[0] = 1 is the centroid itself)
+        - For a new subtree, each node at distance d pairs with the
+          freq[k - d] earlier nodes, then its distances join freq
         
-        # Group nodes by which subtree they belong to
-        subtree_distances = []
+        One pass over the subtrees - no pairwise (A, B) combination step.
+        """
+        target_length = self.target_length
+        dist = self.dist
+        freq = self._freq
+        freq[0] = 1
+        touched = [0]  # Distances whose counters must be reset afterwards
+        paths = 0
         
         for neighbor in self.graph[centroid]:
             if not self.removed[neighbor]:
-                # Get distances within this specific subtree
-                subtree_dist = self.get_distances(neighbor, self.target_length - 1)
-                # Add 1 to each distance (since we're measuring from centroid)
-                subtree_dist = {node: dist + 1 for node, dist in subtree_dist.items()}
-                subtree_distances.append(subtree_dist)
-        
-        # Now count valid path combinations between different subtrees
-        for i in range(len(subtree_distances)):
-            for j in range(i + 1, len(subtree_distances)):
-                # Count paths from subtree i to subtree j
-                self._count_between_subtrees(
-                    subtree_distances[i], 
-                    subtree_distances[j]
-                )
-        
-        # Don't forget paths that start/end at the centroid itself!
-        if self.target_length in all_distances.values():
-            # Count how many nodes are exactly target_length away
-            nodes_at_target_dist = sum(1 for dist in all_distances.values() 
-                                     if dist == self.target_length)
-            self.total_paths += nodes_at_target_dist
-    
-    def _count_between_subtrees(self, subtree1_distances, subtree2_distances):
-        """
-        Count valid paths between two different subtrees.
-        
-        For each node in subtree1 at distance d1, we need nodes in subtree2 
-        at distance (target_length - d1) to form a valid path.
-        """
-        # Create frequency map for subtree2 distances
-        dist_freq = defaultdict(int)
-        for dist in subtree2_distances.values():
-            dist_freq[dist] += 1
+                # Get distances within this specific subtree. A node at
+                # dist[node] from neighbor is dist[node] + 1 from the centroid;
+                # read them straight out of self.dist, no per-subtree copy
+                reached = self.get_distances(neighbor, target_length - 1)
+                
+                # Pair with everything seen so far...
+                # (partner distance = target_length - (dist[node] + 1))
+                partner_base = target_length - 1
+                for node in reached:
+                    paths += freq[partner_base - dist[node]]
+                
+                # ...then make this subtree visible to the next ones
+                for node in reached:
+                    d = dist[node] + 1
+                    if freq[d] == 0:
+                        touched.append(d)
+                    freq[d] += 1
         
-        # For each node in subtree1, find matching nodes in subtree2
-        for dist1 in subtree1_distances.values():
-            needed_dist = self.target_length - dist1
-            if needed_dist in dist_freq:
-                # Each node at dist1 can pair with each node at needed_dist
-                self.total_paths += dist_freq[needed_dist]
+        for d in touched:
+            freq[d] = 0
+        self.total_paths += paths
 
 # Example usage and testing
 def example_usage():
@@ -208,9 +275,8 @@ def example_usage():
      /   / \
     3   4   5
     
-    Paths of length 2: (3,1,0), (0,1,3), (0,2,4), (4,2,0), 
-                       (0,2,5), (5,2,0), (4,2,5), (5,2,4)
-    Total: 8 paths
+    Paths of length 2: (3,1,0), (1,0,2), (0,2,4), (0,2,5), (4,2,5)
+    Total: 5 paths (each path counted once, not once per direction)
     """
     
     print("Creating example tree...")
@@ -229,7 +295,7 @@ def example_usage():
     
     print(f"Number of paths with length {target_length}: {result}")
     
-    # Let's also try length 1 (should be 10: each edge counted twice)
+    # Let's also try length 1 (should be 5: one path per edge)
     cd2 = CentroidDecomposition(6)
     for u, v in edges:
         cd2.add_edge(u, v)
@@ -262,11 +328,16 @@ def stress_test():
     print(f"Paths of length 10: {result}")
     print(f"Time taken: {end_time - start_time:.4f} seconds")
     
-    # For a path graph, paths of length k should be 2*(n-k)
-    # (each internal segment of length k can be traversed in 2 directions)
-    expected = 2 * (n - 10) if n > 10 else 0
+    # For a path graph, paths of length k should be n-k
+    # (one for each starting position of a length-k segment)
+    expected = n - 10 if n > 10 else 0
     print(f"Expected: {expected}")
     print(f"Correct: {result == expected}")
+    
+    # Degenerate lengths: every vertex alone is a path of length 0, and
+    # no path is shorter than that
+    print(f"Length 0 correct: {cd.count_paths_with_length(0) == n}")
+    print(f"Length -1 correct: {cd.count_paths_with_length(-1) == 0}")
 
 if __name__ == "__main__":
     example_usage()
@@ -1,3 +1,9 @@
+from functools import lru_cache
+from math import gcd
+from operator import mul
+
+
+@lru_cache(maxsize=None)
 def extended_gcd(a, b):
     """
     The Extended Euclidean Algorithm - this is like the regular GCD but with superpowers!
@@ -11,21 +17,23 @@ def extended_gcd(a, b):
     Think of it like solving: "I have some number of $5 bills and $7 bills that 
     add up to $1. How many of each do I need?" (when gcd(5,7) = 1)
     """
-    if a == 0:
-        # Base case: gcd(0, b) = b, and 0*0 + b*1 = b
-        return b, 0, 1
-    
-    # Recursively apply the algorithm
-    gcd, x1, y1 = extended_gcd(b % a, a)
-    
-    # Back-substitute to find our coefficients
-    # This math comes from the Euclidean algorithm's steps in reverse
-    x = y1 - (b // a) * x1
-    y = x1
-    
-    return gcd, x, y
+    # Run Euclid forwards, carrying the coefficients along as we go:
+    # at every step old_r = a*old_s + b*old_t and r = a*s + b*t
+    # (a loop instead of recursion, so no call frame per division step)
+    old_r, r = a, b
+    old_s, s = 1, 0
+    old_t, t = 0, 1
+    
+    while r:
+        q = old_r // r
+        old_r, r = r, old_r - q * r
+        old_s, s = s, old_s - q * s
+        old_t, t = t, old_t - q * t
+    
+    return old_r, old_s, old_t
 
 
+@lru_cache(maxsize=None)
 def mod_inverse(a, m):
     """
     Find the modular inverse of 'a' modulo 'm'.
@@ -35,7 +43,19 @@ def mod_inverse(a, m):
     
     This only exists when gcd(a, m) = 1 (a and m are coprime).
     Think of it like finding the "undo" operation for multiplication in modular arithmetic.
+    
+    Python 3.8+ does exactly this inside pow(a, -1, m), in C - see
+    _mod_inverse_py below for the same thing spelled out with extended_gcd.
     """
+    try:
+        return pow(a, -1, m)
+    except ValueError:
+        # No inverse exists - like trying to divide by zero in regular arithmetic
+        raise ValueError(f"Modular inverse of {a} mod {m} doesn't exist (they're not coprime)") from None
+
+
+def _mod_inverse_py(a, m):
+    """The modular inverse computed by hand with extended_gcd (reference version)"""
     gcd, x, y = extended_gcd(a, m)
     
     if gcd != 1:
@@ -47,7 +67,58 @@ def mod_inverse(a, m):
     return (x % m + m) % m
 
 
-def chinese_remainder_theorem(remainders, moduli):
+def _coprime_product(moduli):
+    """
+    Check that the moduli are pairwise coprime and return their product.
+    
+    A new modulus is coprime to every earlier one exactly when it is coprime
+    to their product, so one gcd per modulus replaces checking every pair -
+    and the running product is the "universe size" we need anyway.
+    """
+    total_product = 1
+    for j, m in enumerate(moduli):
+        if gcd(total_product, m) != 1:
+            # Rare path: find an earlier modulus to name in the error
+            for i in range(j):
+                common = gcd(moduli[i], m)
+                if common != 1:
+                    raise ValueError(f"Moduli {moduli[i]} and {m} are not coprime (gcd = {common}). CRT requires pairwise coprime moduli!")
+        total_product *= m
+    return total_product
+
+
+def crt_precompute(moduli):
+    """
+    Do all the remainder-independent work of the CRT once.
+    
+    We solve with Garner's algorithm, which builds x one "mixed-radix digit"
+    at a time:
+    x = d1 + d2*m1 + d3*m1*m2 + ...    with 0 <= di < mi
+    Each digit needs the inverse of (m1 * ... * m(i-1)) modulo mi. Those
+    inverses depend only on the moduli, so when the same moduli are used with
+    many different remainder lists, compute them here once and reuse them.
+    
+    Args:
+        moduli: List of pairwise coprime moduli [m1, m2, m3, ...]
+    
+    Returns:
+        (total_product, [inverse of m1*...*m(i-1) mod mi for each i])
+    """
+    # Check that all moduli are pairwise coprime (gcd = 1 for every pair)
+    # This is required for CRT to work - like making sure puzzle pieces don't overlap
+    # The final answer will be unique modulo their product
+    total_product = _coprime_product(moduli)
+    
+    inverses = []
+    radix = 1  # m1 * ... * m(i-1)
+    for m in moduli:
+        inverses.append(mod_inverse(radix % m, m))
+        radix *= m
+    
+    return total_product, inverses
+
+
+def chinese_remainder_theorem(remainders, moduli, verbose=False):
     """
     Solve a system of congruences using the Chinese Remainder Theorem.
     
@@ -63,9 +134,15 @@ def chinese_remainder_theorem(remainders, moduli):
     When I group by 5, I have 3 left over. When I group by 7, I have 2 left over.
     How many eggs do I have?" This would be solved with remainders=[2,3,2], moduli=[3,5,7]
     
+    We use Garner's algorithm rather than the textbook sum of ri * Mi * yi:
+    every step works modulo a single mi, so no intermediate value grows as
+    big as the product of all the moduli.
+    
     Args:
         remainders: List of remainders [r1, r2, r3, ...]
         moduli: List of moduli [m1, m2, m3, ...]
+        verbose: Print the construction step by step (off by default - the
+                 printing costs far more than the arithmetic)
     
     Returns:
         The unique solution x in the range [0, product_of_all_moduli)
@@ -78,62 +155,101 @@ def chinese_remainder_theorem(remainders, moduli):
     if len(remainders) == 0:
         raise ValueError("Need at least one congruence to solve!")
     
-    # Check that all moduli are pairwise coprime (gcd = 1 for every pair)
-    # This is required for CRT to work - like making sure puzzle pieces don't overlap
-    for i in range(len(moduli)):
-        for j in range(i + 1, len(moduli)):
-            gcd, _, _ = extended_gcd(moduli[i], moduli[j])
-            if gcd != 1:
-                raise ValueError(f"Moduli {moduli[i]} and {moduli[j]} are not coprime (gcd = {gcd}). CRT requires pairwise coprime moduli!")
-    
-    # Calculate the total product - this is our "universe size"
-    # The final answer will be unique modulo this number
-    total_product = 1
-    for m in moduli:
-        total_product *= m
+    total_product, inverses = crt_precompute(moduli)
     
     # This is where the magic happens!
+    # x = d1 + d2*m1 + d3*m1*m2 + ... ; find the digits one at a time
+    digits = []
     solution = 0
+    radix = 1  # m1 * ... * m(i-1)
     
     for i in range(len(remainders)):
-        # For each congruence x ≡ ri (mod mi), we need to:
-        # 1. Find Mi = total_product / mi (product of all OTHER moduli)
-        # 2. Find yi = inverse of Mi modulo mi
-        # 3. Add ri * Mi * yi to our solution
+        m = moduli[i]
         
-        # Step 1: Mi is like a "weight" that's divisible by all moduli except mi
-        Mi = total_product // moduli[i]
+        # Step 1: What do the digits found so far already give, modulo mi?
+        # (Horner's rule from the top digit down, all in small numbers)
+        so_far = 0
+        for j in range(i - 1, -1, -1):
+            so_far = (so_far * moduli[j] + digits[j]) % m
         
-        # Step 2: We need Mi * yi ≡ 1 (mod mi)
-        # This ensures our term contributes exactly ri when taken modulo mi
-        yi = mod_inverse(Mi, moduli[i])
-        
-        # Step 3: Add this term to our solution
-        # This term will be ≡ ri (mod mi) and ≡ 0 (mod mj) for all j ≠ i
-        term = remainders[i] * Mi * yi
-        solution += term
+        # Step 2: The next digit must make up the difference. Every later
+        # term is a multiple of m1*...*mi, so it can't disturb this congruence
+        digit = (remainders[i] - so_far) * inverses[i] % m
+        digits.append(digit)
+        solution += digit * radix
         
         # Optional: show the construction step by step
-        print(f"Step {i+1}: For x ≡ {remainders[i]} (mod {moduli[i]})")
-        print(f"  Mi = {total_product}/{moduli[i]} = {Mi}")
-        print(f"  yi = inverse of {Mi} mod {moduli[i]} = {yi}")
-        print(f"  Term = {remainders[i]} × {Mi} × {yi} = {term}")
-        print(f"  Running solution = {solution}")
-        print()
+        if verbose:
+            print(f"Step {i+1}: For x ≡ {remainders[i]} (mod {m})")
+            print(f"  Digits so far give {so_far} (mod {m})")
+            print(f"  Digit = ({remainders[i]} - {so_far}) × {inverses[i]} mod {m} = {digit}")
+            print(f"  Term = {digit} × {radix} = {digit * radix}")
+            print(f"  Running solution = {solution}")
+            print()
+        
+        radix *= m
     
-    # Reduce to the canonical range [0, total_product)
-    final_solution = solution % total_product
+    # Every digit is in [0, mi), so the solution is already in [0, total_product)
+    final_solution = solution
     
-    print(f"Final answer: x ≡ {final_solution} (mod {total_product})")
+    if verbose:
+        print(f"Final answer: x ≡ {final_solution} (mod {total_product})")
     return final_solution
 
 
-def verify_solution(solution, remainders, moduli):
+def crt_batch(moduli, remainder_rows):
+    """
+    Solve many CRT systems that share the same moduli.
+    
+    For a fixed set of moduli the answer is linear in the remainders:
+    x = (r1*w1 + r2*w2 + ...) mod total_product,  with wi = Mi * yi
+    (Mi = product of the other moduli, yi = its inverse mod mi). So we find
+    the weights once, and each system is then one dot product and one mod.
+    
+    Args:
+        moduli: List of pairwise coprime moduli [m1, m2, m3, ...]
+        remainder_rows: Iterable of remainder lists, one per system
+    
+    Returns:
+        List of solutions, one per row, each in [0, total_product)
+    """
+    if len(moduli) == 0:
+        raise ValueError("Need at least one congruence to solve!")
+    
+    # Validates the moduli (pairwise coprime) and gives us the product; the
+    # Garner inverses from crt_precompute aren't needed here
+    total_product = _coprime_product(moduli)
+    
+    # Mi = (m1 * ... * m(i-1)) * (m(i+1) * ... * mk): prefix and suffix
+    # products give every Mi with multiplications only, instead of one big
+    # division of total_product per modulus
+    k = len(moduli)
+    suffix = [1] * (k + 1)
+    for i in range(k - 1, -1, -1):
+        suffix[i] = suffix[i + 1] * moduli[i]
+    
+    weights = []
+    prefix = 1
+    for i, m in enumerate(moduli):
+        Mi = prefix * suffix[i + 1]
+        weights.append(Mi * mod_inverse(Mi % m, m) % total_product)
+        prefix *= m
+    
+    solutions = []
+    for row in remainder_rows:
+        if len(row) != len(moduli):
+            raise ValueError("Need the same number of remainders and moduli!")
+        solutions.append(sum(map(mul, row, weights)) % total_product)
+    return solutions
+
+
+def verify_solution(solution, remainders, moduli, verbose=False):
     """
     Double-check that our solution actually works.
     This is like checking your math homework - always a good idea!
     """
-    print("Verification:")
+    if verbose:
+        print("Verification:")
     all_correct = True
     
     for i in range(len(remainders)):
@@ -143,12 +259,14 @@ def verify_solution(solution, remainders, moduli):
         is_correct = actual_remainder == expected_remainder
         status = "✓" if is_correct else "✗"
         
-        print(f"  {solution} ≡ {actual_remainder} (mod {moduli[i]}) - Expected: {expected_remainder} {status}")
+        if verbose:
+            print(f"  {solution} ≡ {actual_remainder} (mod {moduli[i]}) - Expected: {expected_remainder} {status}")
         
         if not is_correct:
             all_correct = False
     
-    print(f"\nOverall result: {'All correct! 🎉' if all_correct else 'Something went wrong 😞'}")
+    if verbose:
+        print(f"\nOverall result: {'All correct! 🎉' if all_correct else 'Something went wrong 😞'}")
     return all_correct
 
 
@@ -165,8 +283,8 @@ if __name__ == "__main__":
     moduli1 = [3, 5, 7]
     
     try:
-        solution1 = chinese_remainder_theorem(remainders1, moduli1)
-        verify_solution(solution1, remainders1, moduli1)
+        solution1 = chinese_remainder_theorem(remainders1, moduli1, verbose=True)
+        verify_solution(solution1, remainders1, moduli1, verbose=True)
     except ValueError as e:
         print(f"Error: {e}")
     
@@ -183,8 +301,8 @@ if __name__ == "__main__":
     moduli2 = [2, 3, 5, 11]
     
     try:
-        solution2 = chinese_remainder_theorem(remainders2, moduli2)
-        verify_solution(solution2, remainders2, moduli2)
+        solution2 = chinese_remainder_theorem(remainders2, moduli2, verbose=True)
+        verify_solution(solution2, remainders2, moduli2, verbose=True)
     except ValueError as e:
         print(f"Error: {e}")
     
@@ -200,8 +318,16 @@ if __name__ == "__main__":
     moduli3 = [6, 9]
     
     try:
-        solution3 = chinese_remainder_theorem(remainders3, moduli3)
-        verify_solution(solution3, remainders3, moduli3)
+        solution3 = chinese_remainder_theorem(remainders3, moduli3, verbose=True)
+        verify_solution(solution3, remainders3, moduli3, verbose=True)
     except ValueError as e:
         print(f"Error: {e}")
         print("This is expected! CRT only works when moduli are pairwise coprime.")
+    
+    print("\n" + "="*50 + "\n")
+    
+    # Many systems, same moduli: the weights are computed only once
+    print("Example 4: Batch-solving several systems with moduli [3, 5, 7]")
+    remainder_rows = [[2, 3, 2], [1, 1, 1], [0, 4, 6]]
+    for row, solution in zip(remainder_rows, crt_batch(moduli1, remainder_rows)):
+        print(f"  remainders {row} -> x = {solution}")
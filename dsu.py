@@ -1,3 +1,47 @@
+from array import array
+from bisect import bisect_left
+
+
+# The offline solver calls these directly on RollbackDSU's arrays
+
+def _dsu_find(parent, x):
+    """Walk up to the root of x (no path compression, so rollback stays valid)."""
+    while parent[x] >= 0:
+        x = parent[x]
+    return x
+
+
+def _dsu_union(parent, hist_node, hist_size, x, y):
+    """
+    Union by size, where a root r stores -size(r) in parent[r]. Logs the
+    attached root and its size (-1 and 0 for a no-op union).
+    """
+    root_x = _dsu_find(parent, x)
+    root_y = _dsu_find(parent, y)
+    if root_x == root_y:
+        hist_node.append(-1)
+        hist_size.append(0)
+        return False
+    if parent[root_x] > parent[root_y]:  # root_y is bigger (more negative)
+        root_x, root_y = root_y, root_x
+    hist_node.append(root_y)
+    hist_size.append(-parent[root_y])
+    parent[root_x] += parent[root_y]
+    parent[root_y] = root_x
+    return True
+
+
+def _dsu_rollback_to(parent, hist_node, hist_size, checkpoint):
+    """Undo logged unions until only checkpoint entries remain."""
+    while len(hist_node) > checkpoint:
+        node = hist_node.pop()
+        node_size = hist_size.pop()
+        if node != -1:
+            root = parent[node]
+            parent[root] += node_size
+            parent[node] = -node_size
+
+
 class RollbackDSU:
     """
     Disjoint Set Union with rollback capability.
@@ -8,12 +52,15 @@ class RollbackDSU:
     """
     
     def __init__(self, n):
-        # Each element starts as its own parent (everyone's their own boss initially)
-        self.parent = list(range(n))
-        # Track the size of each component (how many friends each group has)
-        self.size = [1] * n
-        # This is our "undo stack" - keeps track of what we changed
-        self.history = []
+        # Each element starts as its own root (everyone's their own boss
+        # initially). A root r stores -size(r), so one array holds both the
+        # forest and the component sizes (how many friends each group has)
+        self.parent = [-1] * n
+        # This is our "undo stack" - keeps track of what we changed, as two
+        # parallel int arrays instead of one tuple per union: the root that
+        # got attached (-1 for a no-op union) and its size at that moment
+        self.hist_node = array('i')
+        self.hist_size = array('i')
         
     def find(self, x):
         """
@@ -23,9 +70,7 @@ class RollbackDSU:
         our rollback functionality. It's like writing in pen when you need
         to use pencil - you can't erase it later!
         """
-        while self.parent[x] != x:
-            x = self.parent[x]
-        return x
+        return _dsu_find(self.parent, x)
     
     def union(self, x, y):
         """
@@ -33,30 +78,10 @@ class RollbackDSU:
         
         It's like introducing two friend groups - we need to remember
         who was the leader before in case we want to separate them later.
+        Union by size: the smaller group joins the larger one, and the undo
+        log gets the attached root (-1 for a no-op) plus its size.
         """
-        root_x = self.find(x)
-        root_y = self.find(y)
-        
-        # If they're already in the same group, nothing to do
-        if root_x == root_y:
-            # Still need to record this "no-op" for consistent rollback
-            self.history.append(None)
-            return False
-        
-        # Union by size heuristic - smaller group joins the larger one
-        # It's like merging companies - the smaller one usually gets absorbed
-        if self.size[root_x] < self.size[root_y]:
-            root_x, root_y = root_y, root_x
-        
-        # Remember the old state before we change anything
-        # This is our "save point" that we can return to
-        self.history.append((root_y, self.parent[root_y], self.size[root_x]))
-        
-        # Actually perform the union
-        self.parent[root_y] = root_x
-        self.size[root_x] += self.size[root_y]
-        
-        return True
+        return _dsu_union(self.parent, self.hist_node, self.hist_size, x, y)
     
     def rollback(self):
         """
@@ -65,38 +90,25 @@ class RollbackDSU:
         This is like pressing Ctrl+Z - we go back to how things were
         before the last change.
         """
-        if not self.history:
-            return  # Nothing to undo
-        
-        last_op = self.history.pop()
-        
-        if last_op is None:
-            # This was a no-op union, nothing to actually undo
-            return
-        
-        # Unpack what we saved earlier
-        node, old_parent, old_size = last_op
-        
-        # Restore the old state
-        self.parent[node] = old_parent
-        # We need to find the root to restore its size
-        root = self.find(old_parent) if old_parent != node else node
-        if root != node:  # Only restore size if we're not dealing with the root itself
-            self.size[root] = old_size
-            self.size[node] = self.size[node] - old_size + 1
+        if self.hist_node:
+            self.rollback_to(len(self.hist_node) - 1)
+    
+    def component_size(self, x):
+        """Number of elements in the component containing x."""
+        return -self.parent[_dsu_find(self.parent, x)]
     
     def connected(self, x, y):
         """Check if two elements are in the same component."""
-        return self.find(x) == self.find(y)
+        parent = self.parent
+        return _dsu_find(parent, x) == _dsu_find(parent, y)
     
     def get_checkpoint(self):
         """Get current state for later rollback to this exact point."""
-        return len(self.history)
+        return len(self.hist_node)
     
     def rollback_to(self, checkpoint):
         """Roll back to a specific checkpoint."""
-        while len(self.history) > checkpoint:
-            self.rollback()
+        _dsu_rollback_to(self.parent, self.hist_node, self.hist_size, checkpoint)
 
 
 class OfflineDynamicConnectivity:
@@ -110,8 +122,20 @@ class OfflineDynamicConnectivity:
     
     def __init__(self, n):
         self.n = n  # Number of nodes
-        self.operations = []  # All operations we'll process
+        # Edges and queries are kept as parallel columns (struct of arrays)
+        # rather than tagged tuples, so the solver never has to filter them
+        self.edge_u = array('i')
+        self.edge_v = array('i')
+        self.edge_start = array('q')
+        self.edge_end = array('q')
+        self.query_u = array('i')
+        self.query_v = array('i')
+        self.query_time = array('q')  # Query id is the index into these
         self.answers = []  # Results for query operations
+        # Scratch arrays that only live for the duration of solve()
+        self._edge_ids = None
+        self._query_order = None
+        self._query_times = None
     
     def add_edge(self, u, v, time_start, time_end):
         """
@@ -120,16 +144,23 @@ class OfflineDynamicConnectivity:
         Think of this as a temporary bridge - it's only there for a certain
         period of time.
         """
-        self.operations.append(('edge', u, v, time_start, time_end))
+        self.edge_u.append(u)
+        self.edge_v.append(v)
+        self.edge_start.append(time_start)
+        self.edge_end.append(time_end)
     
     def add_query(self, u, v, time):
         """
         Add a connectivity query at a specific time.
         
         This is asking: "Are these two nodes connected at this moment?"
+        Returns the query id, i.e. its index into the answers from solve().
         """
-        query_id = len([op for op in self.operations if op[0] == 'query'])
-        self.operations.append(('query', u, v, time, query_id))
+        query_id = len(self.query_time)
+        self.query_u.append(u)
+        self.query_v.append(v)
+        self.query_time.append(time)
+        return query_id
     
     def solve(self):
         """
@@ -138,77 +169,113 @@ class OfflineDynamicConnectivity:
         This is the magic part - we use a clever recursive approach that
         processes queries efficiently by grouping them smartly.
         """
-        # Separate queries from edges
-        queries = [(op[1], op[2], op[3], op[4]) for op in self.operations if op[0] == 'query']
-        edges = [(op[1], op[2], op[3], op[4]) for op in self.operations if op[0] == 'edge']
+        num_queries = len(self.query_time)
+        self.answers = [False] * num_queries
+        if not num_queries:
+            return self.answers
         
-        self.answers = [False] * len(queries)
+        # Shared scratch for the recursion: one edge index array that every
+        # level partitions in place, and the query ids sorted by time so each
+        # call owns a contiguous run of them
+        num_edges = len(self.edge_u)
+        self._edge_ids = array('i', range(num_edges))
+        query_time = self.query_time
+        self._query_order = sorted(range(num_queries), key=query_time.__getitem__)
+        self._query_times = [query_time[qi] for qi in self._query_order]
         
         # Start the divide and conquer process
-        self._solve_recursive(edges, list(range(len(queries))), queries, 
-                            RollbackDSU(self.n), 0, max(op[3] for op in self.operations) + 1)
+        self._divide_and_conquer(num_edges, num_queries, RollbackDSU(self.n),
+                                 self._query_times[-1] + 1)
         
+        self._edge_ids = self._query_order = self._query_times = None
         return self.answers
     
-    def _solve_recursive(self, edges, query_indices, queries, dsu, time_left, time_right):
+    def _divide_and_conquer(self, num_edges, num_queries, dsu, time_right):
         """
         The heart of our algorithm - divide and conquer with rollback.
         
-        This recursively splits the time range and processes queries.
-        It's like organizing a timeline - we handle different time periods
-        separately but efficiently.
-        """
-        if not query_indices:
-            return  # No queries to process
-        
-        if time_right - time_left == 1:
-            # Base case: single time unit
-            # Check all queries at this time
-            for qi in query_indices:
-                u, v, t, qid = queries[qi]
-                if t == time_left:
-                    self.answers[qid] = dsu.connected(u, v)
-            return
-        
-        time_mid = (time_left + time_right) // 2
-        
-        # Get checkpoint before adding any edges
-        checkpoint = dsu.get_checkpoint()
+        This splits the time range [0, time_right) in halves and processes
+        queries. Edges alive during a whole range are merged into the DSU
+        there; edges alive for only part of it are handed down to the halves
+        they overlap.
         
-        # Add all edges that completely span the left half [time_left, time_mid)
-        edges_added = 0
-        for u, v, start, end in edges:
-            if start <= time_left and end >= time_mid:
-                dsu.union(u, v)
-                edges_added += 1
+        Partial edges that the merged ones already make redundant are pruned
+        before being handed down, so the edge sets shrink as the components
+        grow towards the leaves.
         
-        # Split queries based on which half they belong to
-        left_queries = []
-        right_queries = []
-        
-        for qi in query_indices:
-            u, v, t, qid = queries[qi]
-            if t < time_mid:
-                left_queries.append(qi)
-            else:
-                right_queries.append(qi)
-        
-        # Recursively solve left half
-        # Edges spanning left half are already added to DSU
-        left_edges = [(u, v, start, end) for u, v, start, end in edges 
-                     if not (start <= time_left and end >= time_mid)]
-        self._solve_recursive(left_edges, left_queries, queries, dsu, time_left, time_mid)
+        Runs on an explicit stack instead of recursion. A frame is
+        (edge_count, query_lo, query_hi, time_left, time_right, checkpoint):
+        its candidate edges are self._edge_ids[:edge_count], its queries are
+        self._query_order[query_lo:query_hi], and checkpoint is the DSU
+        history length its parent left behind. Rolling back to it when the
+        frame is popped undoes whatever the previous sibling merged.
+        """
+        edge_ids = self._edge_ids
+        edge_u, edge_v = self.edge_u, self.edge_v
+        edge_start, edge_end = self.edge_start, self.edge_end
+        query_u, query_v, answers = self.query_u, self.query_v, self.answers
+        query_order, query_times = self._query_order, self._query_times
+        parent = dsu.parent
+        hist_node, hist_size = dsu.hist_node, dsu.hist_size
         
-        # Recursively solve right half
-        # We keep the edges we added (they might span into right half too)
-        right_edges = [(u, v, start, end) for u, v, start, end in edges 
-                      if not (start <= time_left and end >= time_mid)]
-        self._solve_recursive(right_edges, right_queries, queries, dsu, time_mid, time_right)
+        stack = [(num_edges, 0, num_queries, 0, time_right, 0)]
+        while stack:
+            edge_count, query_lo, query_hi, time_left, time_right, checkpoint = stack.pop()
+            _dsu_rollback_to(parent, hist_node, hist_size, checkpoint)
+            
+            # Add all edges that completely span [time_left, time_right) and
+            # swap the ones that only partially overlap it to the front of
+            # the slice, where both children will look for them
+            kept = 0
+            for i in range(edge_count):
+                e = edge_ids[i]
+                start = edge_start[e]
+                if start >= time_right:
+                    continue
+                end = edge_end[e]
+                if start <= time_left and end >= time_right:
+                    _dsu_union(parent, hist_node, hist_size, edge_u[e], edge_v[e])
+                elif end > time_left:
+                    edge_ids[i] = edge_ids[kept]
+                    edge_ids[kept] = e
+                    kept += 1
+            
+            # A partial edge whose endpoints the DSU already joins can only
+            # ever be a no-op union further down, so drop it here. Only worth
+            # a pass when this frame merged something new
+            if kept and len(hist_node) > checkpoint:
+                useful = 0
+                for i in range(kept):
+                    e = edge_ids[i]
+                    if _dsu_find(parent, edge_u[e]) != _dsu_find(parent, edge_v[e]):
+                        edge_ids[i] = edge_ids[useful]
+                        edge_ids[useful] = e
+                        useful += 1
+                kept = useful
+            
+            if time_right - time_left == 1:
+                # Base case: single time unit, every query left is asked now
+                for j in range(query_lo, query_hi):
+                    qi = query_order[j]
+                    answers[qi] = _dsu_find(parent, query_u[qi]) == _dsu_find(parent, query_v[qi])
+                continue
+            
+            time_mid = (time_left + time_right) // 2
+            
+            # Queries are sorted by time, so the halves split at one index.
+            # Halves without queries are skipped; the left one is pushed last
+            # so it runs first
+            split = bisect_left(query_times, time_mid, query_lo, query_hi)
+            checkpoint = len(hist_node)
+            if split < query_hi:
+                stack.append((kept, split, query_hi, time_mid, time_right, checkpoint))
+            if query_lo < split:
+                stack.append((kept, query_lo, split, time_left, time_mid, checkpoint))
         
-        # Rollback to checkpoint - clean up the edges we added
+        # Rollback everything - clean up the edges we added
         # This is like cleaning up after a party - we put everything back
         # how it was before we started
-        dsu.rollback_to(checkpoint)
+        _dsu_rollback_to(parent, hist_node, hist_size, 0)
 
 
 def demo_offline_dynamic_connectivity():
@@ -324,7 +391,8 @@ def demo_dsu_rollback():
     print(f"After rollback to checkpoint:")
     print(f"- 0-1? {dsu.connected(0, 1)} (should be True)")
     print(f"- 2-3? {dsu.connected(2, 3)} (should be True)")
-    print(f"- 0-3? {dsu.connected(0, 3)} (should be False)")
+    print(f"- 0-3? {dsu.connected(0, 3)} (should be True, union(1, 2) came before the checkpoint)")
+    print(f"- 0-4? {dsu.connected(0, 4)} (should be False)")
 
 
 if __name__ == "__main__":
@@ -1,3 +1,99 @@
+from array import array
+from itertools import accumulate
+
+# Identity elements for the int64 min/max trees (instead of float infinities,
+# which would not fit in a typed array and mix floats into integer compares)
+INT64_MAX = (1 << 63) - 1
+INT64_MIN = -(1 << 63)
+
+
+# Traversal and segment-tree kernels shared by both Euler tour classes
+
+def _to_csr(tree, n):
+    """
+    Flatten list-of-lists adjacency into compressed sparse rows: the
+    neighbours of v are adj_nodes[adj_start[v]:adj_start[v + 1]].
+    """
+    adj_start = array('i', [0]) * (n + 1)
+    adj_nodes = array('i')
+    for v in range(n):
+        adj_nodes.extend(tree[v])
+        adj_start[v + 1] = len(adj_nodes)
+    return adj_start, adj_nodes
+
+
+def _euler_dfs(adj_start, adj_nodes, root, parent, time, start_time, end_time,
+               euler_tour):
+    """
+    Iterative DFS from root filling the tour arrays; returns the next time.
+    Only node ids are recorded, values are gathered afterwards in one pass.
+    
+    Runs on an explicit stack of (node, parent, next adjacency slot) so deep
+    trees (e.g. long paths) don't hit Python's recursion limit.
+    """
+    stack = [(root, parent, adj_start[root])]
+    while stack:
+        node, parent, k = stack.pop()
+        if k == adj_start[node]:
+            # Record when we enter this node
+            start_time[node] = time
+            euler_tour.append(node)
+            time += 1
+        
+        # Visit the next child, skipping the edge back to the parent
+        end = adj_start[node + 1]
+        while k < end and adj_nodes[k] == parent:
+            k += 1
+        if k < end:
+            stack.append((node, parent, k + 1))
+            stack.append((adj_nodes[k], node, adj_start[adj_nodes[k]]))
+        else:
+            # Record when we exit this node
+            end_time[node] = time - 1
+    return time
+
+
+def _seg_build(t, n, leaves):
+    """
+    Bottom-up sum tree build: leaves go to [n, 2n), then every internal
+    node i is filled from its children 2i and 2i + 1.
+    """
+    t[n:] = leaves
+    for i in range(n - 1, 0, -1):
+        t[i] = t[2 * i] + t[2 * i + 1]
+
+
+def _seg_update(t, n, idx, value):
+    """Set leaf idx and refresh every ancestor on the way up to the root."""
+    i = idx + n
+    t[i] = value
+    i >>= 1
+    while i:
+        t[i] = t[2 * i] + t[2 * i + 1]
+        i >>= 1
+
+
+def _seg_query(t, n, l, r):
+    """
+    Sum over [l, r]. Both ends climb towards the root together; whenever an
+    end sits on a right (left) child, that node is taken and the end moves
+    inwards.
+    """
+    res = 0
+    l += n
+    r += n + 1
+    while l < r:
+        if l & 1:
+            res += t[l]
+            l += 1
+        if r & 1:
+            r -= 1
+            res += t[r]
+        l >>= 1
+        r >>= 1
+    return res
+
+
 class EulerTourSegmentTree:
     """
     A data structure that combines Euler Tour technique with Segment Tree
@@ -7,8 +103,14 @@ class EulerTourSegmentTree:
     1. Convert the tree into a linear array using Euler Tour
     2. Use a segment tree on this array to answer range queries
     3. Each subtree becomes a contiguous range in the linearized representation
+    
+    Tour values and the segment tree are packed into typed arrays, so node
+    values must be integers that fit in 64 bits.
     """
     
+    __slots__ = ('n', 'tree', 'values', 'euler_tour', 'start_time', 'end_time',
+                 'tour_values', 'time', 'seg_size', 'seg_tree', 'prefix')
+    
     def __init__(self, n, tree, values):
         """
         Initialize the data structure.
@@ -23,19 +125,26 @@ class EulerTourSegmentTree:
         self.values = values
         
         # Arrays to store Euler tour information
-        self.euler_tour = []  # The actual Euler tour sequence
-        self.start_time = [0] * n  # When we first visit each node
-        self.end_time = [0] * n    # When we finish processing each node
-        self.tour_values = []      # Values corresponding to the tour
+        self.euler_tour = array('i')  # The actual Euler tour sequence
+        self.start_time = array('i', [0]) * n  # When we first visit each node
+        self.end_time = array('i', [0]) * n    # When we finish processing each node
         
         # Perform DFS to build Euler tour
         self.time = 0
         self._dfs(0, -1)  # Assuming node 0 is root
         
-        # Build segment tree on the linearized data
+        # Values corresponding to the tour, gathered in one pass
+        self.tour_values = array('q', map(values.__getitem__, self.euler_tour))
+        
+        # Build segment tree on the linearized data: leaves live at
+        # [seg_size, 2 * seg_size), node i covers children 2i and 2i + 1
         self.seg_size = len(self.tour_values)
-        self.seg_tree = [0] * (4 * self.seg_size)
-        self._build_segment_tree(1, 0, self.seg_size - 1)
+        self.seg_tree = array('q', [0]) * (2 * self.seg_size)
+        self._build_segment_tree()
+        
+        # Prefix sums over the tour for read-only queries, built on first
+        # use and dropped again by any update
+        self.prefix = None
     
     def _dfs(self, node, parent):
         """
@@ -45,83 +154,26 @@ class EulerTourSegmentTree:
         and exit time when we're done with all its children.
         Everything in between belongs to the subtree.
         """
-        # Record when we enter this node
-        self.start_time[node] = self.time
-        self.euler_tour.append(node)
-        self.tour_values.append(self.values[node])
-        self.time += 1
-        
-        # Visit all children
-        for child in self.tree[node]:
-            if child != parent:  # Don't go back to parent
-                self._dfs(child, node)
-        
-        # Record when we exit this node
-        self.end_time[node] = self.time - 1
+        adj_start, adj_nodes = _to_csr(self.tree, self.n)
+        self.time = _euler_dfs(adj_start, adj_nodes, node, parent, self.time,
+                               self.start_time, self.end_time, self.euler_tour)
     
-    def _build_segment_tree(self, node, start, end):
-        """
-        Build the segment tree for range sum queries.
-        
-        This is a standard segment tree build - each node stores
-        the sum of values in its range.
-        """
-        if start == end:
-            # Leaf node - just store the single value
-            self.seg_tree[node] = self.tour_values[start]
-        else:
-            mid = (start + end) // 2
-            
-            # Build left and right children
-            self._build_segment_tree(2 * node, start, mid)
-            self._build_segment_tree(2 * node + 1, mid + 1, end)
-            
-            # Internal node stores sum of its children
-            self.seg_tree[node] = self.seg_tree[2 * node] + self.seg_tree[2 * node + 1]
-    
-    def _update_segment_tree(self, node, start, end, idx, new_val):
+    def _build_segment_tree(self):
+        """Build the segment tree for range sum queries."""
+        _seg_build(self.seg_tree, self.seg_size, self.tour_values)
+    
+    def _update_segment_tree(self, idx, new_val):
         """
         Update a single element in the segment tree.
         
         When we update a node's value, we need to update the corresponding
         position in our linearized representation.
         """
-        if start == end:
-            # Found the leaf to update
-            self.seg_tree[node] = new_val
-        else:
-            mid = (start + end) // 2
-            
-            if idx <= mid:
-                # Update is in left subtree
-                self._update_segment_tree(2 * node, start, mid, idx, new_val)
-            else:
-                # Update is in right subtree
-                self._update_segment_tree(2 * node + 1, mid + 1, end, idx, new_val)
-            
-            # Update current node after updating children
-            self.seg_tree[node] = self.seg_tree[2 * node] + self.seg_tree[2 * node + 1]
-    
-    def _query_segment_tree(self, node, start, end, l, r):
-        """
-        Query sum in a range [l, r] using segment tree.
-        
-        This is the standard segment tree range query.
-        """
-        if r < start or l > end:
-            # No overlap
-            return 0
-        
-        if l <= start and end <= r:
-            # Complete overlap - return this node's value
-            return self.seg_tree[node]
-        
-        # Partial overlap - query both children
-        mid = (start + end) // 2
-        left_sum = self._query_segment_tree(2 * node, start, mid, l, r)
-        right_sum = self._query_segment_tree(2 * node + 1, mid + 1, end, l, r)
-        
-        return left_sum + right_sum
+        _seg_update(self.seg_tree, self.seg_size, idx, new_val)
+    
+    def _query_segment_tree(self, l, r):
+        """Query sum in a range [l, r] using segment tree."""
+        return _seg_query(self.seg_tree, self.seg_size, l, r)
     
     def update_node(self, node_id, new_value):
         """
@@ -135,8 +187,8 @@ class EulerTourSegmentTree:
         self.tour_values[self.start_time[node_id]] = new_value
         
         # Update the segment tree
-        self._update_segment_tree(1, 0, self.seg_size - 1, 
-                                 self.start_time[node_id], new_value)
+        self._update_segment_tree(self.start_time[node_id], new_value)
+        self.prefix = None
     
     def query_subtree_sum(self, root_node):
         """
@@ -146,10 +198,50 @@ class EulerTourSegmentTree:
         in the subtree of root_node appear in the range 
         [start_time[root_node], end_time[root_node]]
         """
-        start = self.start_time[root_node]
-        end = self.end_time[root_node]
+        return _seg_query(self.seg_tree, self.seg_size,
+                          self.start_time[root_node], self.end_time[root_node])
+    
+    def query_subtree_sum_batch(self, roots):
+        """
+        Subtree sums for many roots at once, in the order given.
+        
+        Same as calling query_subtree_sum per root, but the arrays are
+        looked up once for the whole batch instead of once per query.
+        
+        Once a batch is big enough that k * log n tree walks cost more than
+        one O(n) pass (or the prefix sums are already built and still
+        valid), every query is answered in O(1) from prefix sums instead,
+        so large batches cost O(n + k) overall.
+        """
+        roots = list(roots)
+        start_time, end_time = self.start_time, self.end_time
+        n = self.seg_size
+        prefix = self.prefix
+        if prefix is None and len(roots) * n.bit_length() >= n:
+            prefix = self._build_prefix()
+        if prefix is not None:
+            return [prefix[end_time[v] + 1] - prefix[start_time[v]] for v in roots]
+        t = self.seg_tree
+        return [_seg_query(t, n, start_time[v], end_time[v]) for v in roots]
+    
+    def query_subtree_sum_ro(self, root_node):
+        """
+        Same answer as query_subtree_sum, in O(1) from prefix sums.
         
-        return self._query_segment_tree(1, 0, self.seg_size - 1, start, end)
+        Subtrees are contiguous tour ranges, so with no updates in between
+        a sum is just prefix[end + 1] - prefix[start]. The prefix array
+        costs one O(n) pass on first use after construction or an update,
+        so this is the faster path for static / offline query batches.
+        """
+        prefix = self.prefix
+        if prefix is None:
+            prefix = self._build_prefix()
+        return prefix[self.end_time[root_node] + 1] - prefix[self.start_time[root_node]]
+    
+    def _build_prefix(self):
+        """(Re)build prefix sums over the tour values: prefix[i] = sum of the first i."""
+        self.prefix = array('q', accumulate(self.tour_values, initial=0))
+        return self.prefix
     
     def print_debug_info(self):
         """
@@ -157,8 +249,8 @@ class EulerTourSegmentTree:
         """
         print("=== Euler Tour Debug Information ===")
         print(f"Original tree values: {self.values}")
-        print(f"Euler tour sequence: {self.euler_tour}")
-        print(f"Tour values: {self.tour_values}")
+        print(f"Euler tour sequence: {self.euler_tour.tolist()}")
+        print(f"Tour values: {self.tour_values.tolist()}")
         print()
         
         print("Node timing information:")
@@ -247,107 +339,140 @@ class EulerTourSegmentTreeAdvanced:
     - Range updates (lazy propagation)
     """
     
+    __slots__ = ('n', 'tree', 'values', 'euler_tour', 'start_time', 'end_time',
+                 'tour_values', 'time', 'seg_size', 'sum_tree', 'min_tree',
+                 'max_tree', 'lazy')
+    
     def __init__(self, n, tree, values):
         self.n = n
         self.tree = tree
         self.values = values
         
         # Euler tour arrays
-        self.euler_tour = []
-        self.start_time = [0] * n
-        self.end_time = [0] * n
-        self.tour_values = []
+        self.euler_tour = array('i')
+        self.start_time = array('i', [0]) * n
+        self.end_time = array('i', [0]) * n
         
         # Build Euler tour
         self.time = 0
         self._dfs(0, -1)
+        self.tour_values = array('q', map(values.__getitem__, self.euler_tour))
         
-        # Segment tree arrays
+        # Segment tree arrays (iterative layout, leaves at [seg_size, 2 * seg_size))
         self.seg_size = len(self.tour_values)
-        self.sum_tree = [0] * (4 * self.seg_size)
-        self.min_tree = [float('inf')] * (4 * self.seg_size)
-        self.max_tree = [float('-inf')] * (4 * self.seg_size)
-        self.lazy = [0] * (4 * self.seg_size)  # For lazy propagation
+        self.sum_tree = array('q', [0]) * (2 * self.seg_size)
+        self.min_tree = array('q', [INT64_MAX]) * (2 * self.seg_size)
+        self.max_tree = array('q', [INT64_MIN]) * (2 * self.seg_size)
+        self.lazy = array('q', [0]) * (2 * self.seg_size)  # For lazy propagation
         
-        self._build_advanced_tree(1, 0, self.seg_size - 1)
+        self._build_advanced_tree()
     
-    def _dfs(self, node, parent):
-        """Same DFS as basic version."""
-        self.start_time[node] = self.time
-        self.euler_tour.append(node)
-        self.tour_values.append(self.values[node])
-        self.time += 1
-        
-        for child in self.tree[node]:
-            if child != parent:
-                self._dfs(child, node)
-        
-        self.end_time[node] = self.time - 1
+    # Same iterative DFS as the basic version
+    _dfs = EulerTourSegmentTree._dfs
     
-    def _build_advanced_tree(self, node, start, end):
+    def _build_advanced_tree(self):
         """Build segment tree with sum, min, and max."""
-        if start == end:
-            val = self.tour_values[start]
-            self.sum_tree[node] = val
-            self.min_tree[node] = val
-            self.max_tree[node] = val
-        else:
-            mid = (start + end) // 2
-            self._build_advanced_tree(2 * node, start, mid)
-            self._build_advanced_tree(2 * node + 1, mid + 1, end)
-            
-            # Combine results from children
-            self.sum_tree[node] = self.sum_tree[2 * node] + self.sum_tree[2 * node + 1]
-            self.min_tree[node] = min(self.min_tree[2 * node], self.min_tree[2 * node + 1])
-            self.max_tree[node] = max(self.max_tree[2 * node], self.max_tree[2 * node + 1])
+        n = self.seg_size
+        sum_tree, min_tree, max_tree = self.sum_tree, self.min_tree, self.max_tree
+        sum_tree[n:] = self.tour_values
+        min_tree[n:] = self.tour_values
+        max_tree[n:] = self.tour_values
+        
+        # Combine results from children
+        for i in range(n - 1, 0, -1):
+            a, b = 2 * i, 2 * i + 1
+            sum_tree[i] = sum_tree[a] + sum_tree[b]
+            min_tree[i] = min(min_tree[a], min_tree[b])
+            max_tree[i] = max(max_tree[a], max_tree[b])
     
     def query_subtree_sum(self, root_node):
         """Get sum of subtree."""
         start, end = self.start_time[root_node], self.end_time[root_node]
-        return self._query_sum(1, 0, self.seg_size - 1, start, end)
+        return self._query_sum(start, end)
     
     def query_subtree_min(self, root_node):
         """Get minimum value in subtree."""
         start, end = self.start_time[root_node], self.end_time[root_node]
-        return self._query_min(1, 0, self.seg_size - 1, start, end)
+        return self._query_min(start, end)
     
     def query_subtree_max(self, root_node):
         """Get maximum value in subtree."""
         start, end = self.start_time[root_node], self.end_time[root_node]
-        return self._query_max(1, 0, self.seg_size - 1, start, end)
+        return self._query_max(start, end)
     
-    def _query_sum(self, node, start, end, l, r):
-        """Query sum in range [l, r]."""
-        if r < start or l > end:
-            return 0
-        if l <= start and end <= r:
-            return self.sum_tree[node]
+    def query_subtree_summary(self, root_node):
+        """
+        Get (sum, min, max) of a subtree with a single walk up the trees.
         
-        mid = (start + end) // 2
-        return (self._query_sum(2 * node, start, mid, l, r) + 
-                self._query_sum(2 * node + 1, mid + 1, end, l, r))
+        Cheaper than calling the three single-aggregate queries when a
+        caller needs all of them: the index arithmetic is shared and each
+        visited node reads its sum/min/max entries together.
+        """
+        start, end = self.start_time[root_node], self.end_time[root_node]
+        return self._query_summary(start, end)
+    
+    def _query_summary(self, l, r):
+        """Query (sum, min, max) in range [l, r]."""
+        sum_tree, min_tree, max_tree = self.sum_tree, self.min_tree, self.max_tree
+        total, lo, hi = 0, INT64_MAX, INT64_MIN
+        l += self.seg_size
+        r += self.seg_size + 1
+        while l < r:
+            if l & 1:
+                total += sum_tree[l]
+                if min_tree[l] < lo:
+                    lo = min_tree[l]
+                if max_tree[l] > hi:
+                    hi = max_tree[l]
+                l += 1
+            if r & 1:
+                r -= 1
+                total += sum_tree[r]
+                if min_tree[r] < lo:
+                    lo = min_tree[r]
+                if max_tree[r] > hi:
+                    hi = max_tree[r]
+            l >>= 1
+            r >>= 1
+        return total, lo, hi
     
-    def _query_min(self, node, start, end, l, r):
+    def _query_sum(self, l, r):
+        """Query sum in range [l, r]."""
+        return _seg_query(self.sum_tree, self.seg_size, l, r)
+    
+    def _query_min(self, l, r):
         """Query minimum in range [l, r]."""
-        if r < start or l > end:
-            return float('inf')
-        if l <= start and end <= r:
-            return self.min_tree[node]
-        
-        mid = (start + end) // 2
-        return min(self._query_min(2 * node, start, mid, l, r),
-                   self._query_min(2 * node + 1, mid + 1, end, l, r))
+        t = self.min_tree
+        res = INT64_MAX
+        l += self.seg_size
+        r += self.seg_size + 1
+        while l < r:
+            if l & 1:
+                res = min(res, t[l])
+                l += 1
+            if r & 1:
+                r -= 1
+                res = min(res, t[r])
+            l >>= 1
+            r >>= 1
+        return res
     
-    def _query_max(self, node, start, end, l, r):
+    def _query_max(self, l, r):
         """Query maximum in range [l, r]."""
-        if r < start or l > end:
-            return float('-inf')
-        if l <= start and end <= r:
-            return self.max_tree[node]
-        
-        mid = (start + end) // 2
-        return max(self._query_max(2 * node, start, mid, l, r),
-                   self._query_max(2 * node + 1, mid + 1, end, l, r))
+        t = self.max_tree
+        res = INT64_MIN
+        l += self.seg_size
+        r += self.seg_size + 1
+        while l < r:
+            if l & 1:
+                res = max(res, t[l])
+                l += 1
+            if r & 1:
+                r -= 1
+                res = max(res, t[r])
+            l >>= 1
+            r >>= 1
+        return res
 
 
 if __name__ == "__main__":
@@ -1,3 +1,58 @@
+from array import array
+from operator import add
+
+
+# Fenwick walks over the flat tree array; row r starts at r * stride
+
+def _bit2d_update(tree, stride, rows, cols, row, col, delta):
+    """Add delta at 1-based (row, col), climbing with i += i & -i on both axes."""
+    r = row
+    while r <= rows:
+        base = r * stride
+        c = col
+        while c <= cols:
+            tree[base + c] += delta
+            c += c & -c
+        r += r & -r
+
+
+def _bit2d_query(tree, stride, row, col):
+    """Sum of the 1-based prefix rectangle (1, 1)..(row, col)."""
+    total_sum = 0
+    r = row
+    while r > 0:
+        base = r * stride
+        c = col
+        while c > 0:
+            total_sum += tree[base + c]
+            c -= c & -c
+        r -= r & -r
+    return total_sum
+
+
+def _bit2d_build(tree, stride, rows, cols):
+    """
+    Turn raw cell values (already at their 1-based slots) into a Fenwick tree
+    in O(rows * cols): push every cell into its parent along the columns,
+    then push every finished row into its parent row.
+    """
+    for r in range(1, rows + 1):
+        base = r * stride
+        for c in range(1, cols + 1):
+            parent = c + (c & -c)
+            if parent <= cols:
+                tree[base + parent] += tree[base + c]
+    # Rows are independent across columns, so push each row into its parent
+    # row as one bulk element-wise add instead of a per-cell Python loop
+    for r in range(1, rows + 1):
+        parent = r + (r & -r)
+        if parent <= rows:
+            base, parent_base = r * stride, parent * stride
+            tree[parent_base + 1:parent_base + stride] = array(
+                'q', map(add, tree[parent_base + 1:parent_base + stride],
+                         tree[base + 1:base + stride]))
+
+
 class BinaryIndexedTree2D:
     """
     A 2D Binary Indexed Tree (also known as 2D Fenwick Tree) for efficient
@@ -21,8 +76,49 @@ class BinaryIndexedTree2D:
         """
         self.rows = rows
         self.cols = cols
-        # Create a 2D array filled with zeros - this will store our tree
-        self.tree = [[0] * (cols + 1) for _ in range(rows + 1)]
+        # One flat row-major int64 array instead of a list of row lists:
+        # cell (r, c) lives at tree[r * stride + c]
+        self.stride = cols + 1
+        self.tree = array('q', [0]) * ((rows + 1) * self.stride)
+        # Shadow copy of the plain cell values (0-based, row-major), so a
+        # single cell can be read in O(1) instead of by range_query
+        self._raw = array('q', [0]) * (rows * cols)
+    
+    @classmethod
+    def from_matrix(cls, matrix, rows=None, cols=None):
+        """
+        Build a BIT holding the values of a 2D list in O(rows * cols),
+        instead of rows * cols separate O(log n * log m) updates.
+        
+        Missing cells of a short or ragged matrix count as zero.
+        """
+        if rows is None:
+            rows = len(matrix)
+        if cols is None:
+            cols = max((len(row) for row in matrix), default=0)
+        bit = cls(rows, cols)
+        raw = bit._raw
+        for i, row in enumerate(matrix[:rows]):
+            row = array('q', row[:cols])
+            raw[i * cols:i * cols + len(row)] = row
+        bit._rebuild()
+        return bit
+    
+    def _rebuild(self):
+        """Rebuild the whole tree from the shadow cell values in O(rows * cols)."""
+        rows, cols, stride = self.rows, self.cols, self.stride
+        tree, raw = self.tree, self._raw
+        tree[:stride] = array('q', [0]) * stride
+        for i in range(rows):
+            start = (i + 1) * stride
+            tree[start] = 0
+            tree[start + 1:start + stride] = raw[i * cols:(i + 1) * cols]
+        _bit2d_build(tree, stride, rows, cols)
+    
+    def get_matrix(self):
+        """Return the whole matrix as a list of rows, read from the shadow copy."""
+        raw, cols = self._raw, self.cols
+        return [raw[r * cols:(r + 1) * cols].tolist() for r in range(self.rows)]
     
     def update(self, row, col, delta):
         """
@@ -38,22 +134,55 @@ class BinaryIndexedTree2D:
         Think of i & -i as "what's the rightmost bit that's set in i?"
         Adding this to i effectively moves us up the tree to the parent node.
         """
+        self._raw[row * self.cols + col] += delta
+        
         # Convert to 1-based indexing for internal calculations
         row += 1
         col += 1
         
-        # Start from our target row and work our way up the tree
-        r = row
-        while r <= self.rows:
-            # For this row, update all relevant columns
-            c = col
-            while c <= self.cols:
-                self.tree[r][c] += delta
-                # Move to the next column position that needs updating
-                # This bit trick finds the next position up the column tree
-                c += c & -c
-            # Move to the next row position that needs updating
-            r += r & -r
+        _bit2d_update(self.tree, self.stride, self.rows, self.cols,
+                      row, col, delta)
+    
+    def update_batch(self, updates):
+        """
+        Apply many (row, col, delta) updates at once.
+        
+        Deltas for the same cell are merged first. If the batch is large
+        enough that its Fenwick walks would cost more than touching every
+        cell, the tree is rebuilt from the shadow values in O(rows * cols).
+        Otherwise the column walks are grouped by the tree row they land
+        in, so each tree row is visited once with all of its pending
+        column deltas (in column order) rather than once per update.
+        """
+        rows, cols, stride = self.rows, self.cols, self.stride
+        tree, raw = self.tree, self._raw
+        
+        pending = {}
+        for row, col, delta in updates:
+            raw[row * cols + col] += delta
+            key = (row + 1, col + 1)
+            pending[key] = pending.get(key, 0) + delta
+        
+        if len(pending) * rows.bit_length() * cols.bit_length() >= rows * cols:
+            self._rebuild()
+            return
+        
+        # Fan each cell out over the tree rows its row walk visits
+        by_tree_row = {}
+        for (row, col), delta in pending.items():
+            r = row
+            while r <= rows:
+                col_deltas = by_tree_row.setdefault(r, {})
+                col_deltas[col] = col_deltas.get(col, 0) + delta
+                r += r & -r
+        
+        for r in sorted(by_tree_row):
+            base = r * stride
+            for col, delta in sorted(by_tree_row[r].items()):
+                c = col
+                while c <= cols:
+                    tree[base + c] += delta
+                    c += c & -c
     
     def _query(self, row, col):
         """
@@ -73,18 +202,42 @@ class BinaryIndexedTree2D:
         row += 1
         col += 1
         
-        total_sum = 0
-        r = row
-        while r > 0:
-            c = col
-            while c > 0:
-                total_sum += self.tree[r][c]
-                # Move to the previous column position in our tree traversal
-                c -= c & -c
-            # Move to the previous row position in our tree traversal
-            r -= r & -r
+        return _bit2d_query(self.tree, self.stride, row, col)
+    
+    def batch_point_query(self, points):
+        """
+        Prefix sums (0,0)..(row, col) for many (row, col) points at once.
         
-        return total_sum
+        Every point's row walk visits O(log n) tree rows and does a column
+        walk on each. Points that share a tree row and column share that
+        column walk, so each distinct (tree row, col) partial sum is only
+        computed once per batch.
+        """
+        tree, stride = self.tree, self.stride
+        partials = {}
+        results = []
+        for row, col in points:
+            if row < 0 or col < 0:
+                results.append(0)
+                continue
+            col += 1
+            total_sum = 0
+            r = row + 1
+            while r > 0:
+                key = r * stride + col
+                part = partials.get(key)
+                if part is None:
+                    part = 0
+                    base = r * stride
+                    c = col
+                    while c > 0:
+                        part += tree[base + c]
+                        c -= c & -c
+                    partials[key] = part
+                total_sum += part
+                r -= r & -r
+            results.append(total_sum)
+        return results
     
     def range_query(self, row1, col1, row2, col2):
         """
@@ -124,21 +277,19 @@ class BinaryIndexedTree2D:
         Set the element at (row, col) to new_value.
         
         Since our BIT only supports adding deltas, we need to:
-        1. Calculate what the current value is
+        1. Look up what the current value is (O(1) from the shadow copy)
         2. Find the difference between new and current value
         3. Apply that difference as an update
-        
-        Note: This requires us to track original values, which adds complexity.
-        In practice, you might want to maintain a separate matrix for this.
         """
-        # For simplicity, we'll implement this by getting current value
-        # and applying the difference. In a real implementation, you'd
-        # probably want to store the original matrix separately.
-        current_value = self.range_query(row, col, row, col)
-        delta = new_value - current_value
+        delta = new_value - self._raw[row * self.cols + col]
         self.update(row, col, delta)
 
 
+def _format_grid(grid):
+    """Render a matrix as one string, three columns per value, one line per row."""
+    return "\n".join("".join(f"{value:3d} " for value in row) for row in grid)
+
+
 def demonstrate_2d_bit():
     """
     Let's see our 2D BIT in action with some examples!
@@ -148,10 +299,7 @@ def demonstrate_2d_bit():
     bit = BinaryIndexedTree2D(4, 4)
     
     print("\nInitial state: all zeros")
-    for i in range(4):
-        for j in range(4):
-            print(f"{bit.range_query(i, j, i, j):3d}", end=" ")
-        print()
+    print(_format_grid(bit.get_matrix()))
     
     print("\nLet's add some values to our matrix...")
     # Add 5 to position (1, 1)
@@ -167,10 +315,7 @@ def demonstrate_2d_bit():
     print("Added 7 to position (0,3)")
     
     print("\nCurrent matrix values:")
-    for i in range(4):
-        for j in range(4):
-            print(f"{bit.range_query(i, j, i, j):3d}", end=" ")
-        print()
+    print(_format_grid(bit.get_matrix()))
     
     print("\nTesting range queries...")
     
@@ -190,10 +335,7 @@ def demonstrate_2d_bit():
     bit.update(1, 1, 2)
     
     print("New matrix values:")
-    for i in range(4):
-        for j in range(4):
-            print(f"{bit.range_query(i, j, i, j):3d}", end=" ")
-        print()
+    print(_format_grid(bit.get_matrix()))
     
     # Verify the sum changed correctly
     new_sum_rect2 = bit.range_query(1, 1, 2, 2)
@@ -214,16 +356,15 @@ class Matrix2D:
         self.rows = rows
         self.cols = cols
         self.matrix = [[0] * cols for _ in range(rows)]
-        self.bit = BinaryIndexedTree2D(rows, cols)
         
         # If we're given an initial matrix, set it up
         if initial_matrix:
-            for i in range(rows):
-                for j in range(cols):
-                    if i < len(initial_matrix) and j < len(initial_matrix[i]):
-                        value = initial_matrix[i][j]
-                        self.matrix[i][j] = value
-                        self.bit.update(i, j, value)
+            for i in range(min(rows, len(initial_matrix))):
+                row = initial_matrix[i][:cols]
+                self.matrix[i][:len(row)] = row
+        
+        # Build the BIT from all values at once rather than one update per cell
+        self.bit = BinaryIndexedTree2D.from_matrix(self.matrix, rows, cols)
     
     def set(self, row, col, value):
         """Set a specific position to a value."""
@@ -248,8 +389,7 @@ class Matrix2D:
     def print_matrix(self):
         """Print the current state of the matrix."""
         print("Current matrix:")
-        for row in self.matrix:
-            print([f"{x:3d}" for x in row])
+        print("\n".join(str([f"{x:3d}" for x in row]) for row in self.matrix))
 
 
 def demonstrate_matrix2d():
@@ -1,3 +1,57 @@
+from array import array
+from operator import add
+
+# Identity elements for the int64 min/max segment trees
+INT64_MAX = (1 << 63) - 1
+INT64_MIN = -(1 << 63)
+
+
+# Iterative segment tree over a flat array: leaves at [n, 2n), node i has
+# children 2i and 2i + 1. The same two helpers drive the sum, min and max
+# trees; only the combine function and its identity differ.
+
+def _seg_assign(tree, n, pos, value, combine):
+    """Set leaf pos to value and recombine every ancestor up to the root."""
+    i = pos + n
+    tree[i] = value
+    i >>= 1
+    while i:
+        tree[i] = combine(tree[2 * i], tree[2 * i + 1])
+        i >>= 1
+
+
+def _seg_build(tree, n, leaves, combine):
+    """Copy leaves into [n, 2n), then fill every internal node bottom-up."""
+    tree[n:] = leaves
+    for i in range(n - 1, 0, -1):
+        tree[i] = combine(tree[2 * i], tree[2 * i + 1])
+
+
+def _seg_fold(tree, n, l, r, combine, identity):
+    """Combine the leaves in [l, r], both ends climbing towards the root."""
+    res = identity
+    l += n
+    r += n + 1
+    while l < r:
+        if l & 1:
+            res = combine(res, tree[l])
+            l += 1
+        if r & 1:
+            r -= 1
+            res = combine(res, tree[r])
+        l >>= 1
+        r >>= 1
+    return res
+
+
+# Per query type: which segment tree to read, how to combine, and the identity
+_AGGREGATES = {
+    "sum": ("sum_tree", add, 0),
+    "max": ("max_tree", max, INT64_MIN),
+    "min": ("min_tree", min, INT64_MAX),
+}
+
+
 class HeavyLightDecomposition:
     """
     Heavy-Light Decomposition for efficient path queries on trees.
@@ -10,32 +64,54 @@ class HeavyLightDecomposition:
     - Heavy edge: connects a node to its child with the largest subtree
     - Light edge: all other edges
     - Chain: maximal path of heavy edges
+    
+    Index arrays are 32-bit, which caps trees at 2^31 - 1 nodes. Node
+    values use value_typecode ('q' for 64-bit by default, 'i' for 32-bit
+    to halve the value and min/max tree memory); path sums are always kept
+    in 64 bits since they can outgrow a single value.
     """
     
-    def __init__(self, n):
+    def __init__(self, n, value_typecode='q'):
         """
         Initialize HLD for a tree with n nodes (0-indexed).
         
         Args:
             n: number of nodes in the tree
+            value_typecode: array typecode for node values ('q' or 'i')
         """
         self.n = n
         self.graph = [[] for _ in range(n)]  # adjacency list
         
-        # Arrays to store decomposition info
-        self.parent = [-1] * n          # parent of each node
-        self.depth = [0] * n            # depth from root
-        self.subtree_size = [0] * n     # size of subtree rooted at each node
-        self.heavy_child = [-1] * n     # heavy child of each node (-1 if none)
+        # Arrays to store decomposition info, one packed int array per field
+        # (struct of arrays) rather than lists of boxed ints
+        self.parent = array('i', [-1]) * n       # parent of each node
+        self.depth = array('i', [0]) * n         # depth from root
+        self.subtree_size = array('i', [0]) * n  # size of subtree rooted at each node
+        self.heavy_child = array('i', [-1]) * n  # heavy child of each node (-1 if none)
         
         # Chain decomposition info
-        self.chain_head = [0] * n       # head of the chain containing each node
-        self.chain_pos = [0] * n        # position of node within its chain
-        self.chain_count = 0            # total number of chains
-        
-        # For range queries on chains - we'll use a simple array here
-        # In practice, you'd want a segment tree or fenwick tree
-        self.values = [0] * n           # node values
+        self.chain_head = array('i', [0]) * n    # head of the chain containing each node
+        self.chain_pos = array('i', [0]) * n     # position of node within its chain
+        self.chain_count = 0                     # total number of chains
+        
+        # Per-chain metadata as a struct of arrays indexed by chain id, so a
+        # chain jump reads chain_id[u] once and then small, hot arrays
+        self.chain_id = array('i', [0]) * n      # chain id of each node
+        self.chain_head_tin = array('i')         # tin of each chain's head
+        self.chain_head_parent = array('i')      # parent of each chain's head
+        self.chain_head_depth = array('i')       # depth of each chain's head
+        
+        self.values = array(value_typecode, [0]) * n  # node values
+        value_bits = 8 * self.values.itemsize
+        
+        # For range queries on chains: every node gets a position tin in a
+        # heavy-first DFS order, so each chain is one contiguous range, and
+        # segment trees over that order answer sum/min/max per chain
+        self.tin = array('i', [0]) * n
+        self.sum_tree = array('q', [0]) * (2 * n)
+        self.min_tree = array(value_typecode, [(1 << (value_bits - 1)) - 1]) * (2 * n)
+        self.max_tree = array(value_typecode, [-(1 << (value_bits - 1))]) * (2 * n)
+        self._built = False
         
     def add_edge(self, u, v):
         """Add an undirected edge between nodes u and v."""
@@ -50,71 +126,130 @@ class HeavyLightDecomposition:
         1. First DFS: compute parent, depth, subtree size, and heavy children
         2. Second DFS: decompose into chains
         """
+        adj_start, adj_nodes = self._build_csr()
+        
         # Step 1: Find heavy children
-        self._dfs_sizes(root, -1)
+        self._dfs_sizes(root, adj_start, adj_nodes)
         
         # Step 2: Decompose into chains
-        self._dfs_decompose(root, -1, root)
+        self._dfs_decompose(root, adj_start, adj_nodes)
+        
+        # Step 3: Load the node values into the segment trees, laid out in
+        # tin order, and fold them up in one O(n) pass per tree
+        order = array('i', [0]) * self.n
+        for node, t in enumerate(self.tin):
+            order[t] = node
+        values = self.values
+        leaves = array(values.typecode, map(values.__getitem__, order))
+        sum_leaves = leaves if leaves.typecode == 'q' else array('q', leaves)
+        _seg_build(self.sum_tree, self.n, sum_leaves, add)
+        _seg_build(self.min_tree, self.n, leaves, min)
+        _seg_build(self.max_tree, self.n, leaves, max)
+        self._built = True
+    
+    def _build_csr(self):
+        """
+        Flatten the adjacency lists into two arrays (compressed sparse rows):
+        the neighbours of v are adj_nodes[adj_start[v]:adj_start[v + 1]].
+        """
+        adj_start = array('i', [0]) * (self.n + 1)
+        adj_nodes = array('i')
+        for v in range(self.n):
+            adj_nodes.extend(self.graph[v])
+            adj_start[v + 1] = len(adj_nodes)
+        return adj_start, adj_nodes
     
-    def _dfs_sizes(self, node, par):
+    def _dfs_sizes(self, root, adj_start, adj_nodes):
         """
-        First DFS: compute subtree sizes and identify heavy children.
+        First pass: compute subtree sizes and identify heavy children.
         
         A heavy child is the child with the largest subtree.
         This ensures that going down a heavy edge doesn't decrease
         the subtree size by more than half.
-        """
-        self.parent[node] = par
-        self.subtree_size[node] = 1
-        
-        max_child_size = 0
         
-        for child in self.graph[node]:
-            if child == par:
-                continue
-                
-            # Set depth of child
-            self.depth[child] = self.depth[node] + 1
-            
-            # Recursively process child's subtree
-            self._dfs_sizes(child, node)
-            
-            # Update our subtree size
-            self.subtree_size[node] += self.subtree_size[child]
-            
-            # Check if this child should be our heavy child
-            if self.subtree_size[child] > max_child_size:
-                max_child_size = self.subtree_size[child]
-                self.heavy_child[node] = child
+        Done without recursion so deep trees don't hit the recursion limit:
+        list the nodes in BFS order (parents before children, which also
+        fixes parent and depth), then sweep that list backwards adding each
+        size into its parent.
+        """
+        parent, depth = self.parent, self.depth
+        subtree_size, heavy_child = self.subtree_size, self.heavy_child
+        
+        parent[root] = -1
+        depth[root] = 0
+        order = [root]
+        for node in order:
+            par = parent[node]
+            subtree_size[node] = 1
+            heavy_child[node] = -1
+            for k in range(adj_start[node], adj_start[node + 1]):
+                child = adj_nodes[k]
+                if child != par:
+                    parent[child] = node
+                    depth[child] = depth[node] + 1
+                    order.append(child)
+        
+        # Children come after their parents, so a reverse sweep is a
+        # post-order. Siblings are met in reverse adjacency order, so ">="
+        # keeps the first of several equally large children as the heavy one
+        for i in range(len(order) - 1, 0, -1):
+            child = order[i]
+            par = parent[child]
+            subtree_size[par] += subtree_size[child]
+            if heavy_child[par] == -1 or subtree_size[child] >= subtree_size[heavy_child[par]]:
+                heavy_child[par] = child
     
-    def _dfs_decompose(self, node, par, head):
+    def _dfs_decompose(self, root, adj_start, adj_nodes):
         """
-        Second DFS: decompose the tree into heavy chains.
+        Second pass: decompose the tree into heavy chains.
         
         Each chain is a maximal path of heavy edges.
         We assign each node a position within its chain.
-        """
-        # This node belongs to the chain starting at 'head'
-        self.chain_head[node] = head
         
-        # If this is the start of a new chain, assign it a new chain ID
-        if head == node:
-            self.chain_pos[node] = self.chain_count
-            self.chain_count += 1
-        else:
-            # Continue the current chain
-            self.chain_pos[node] = self.chain_pos[self.parent[node]] + 1
-        
-        # First, process the heavy child (if it exists) to continue the chain
-        if self.heavy_child[node] != -1:
-            self._dfs_decompose(self.heavy_child[node], node, head)
-        
-        # Then process all light children, each starting a new chain
-        for child in self.graph[node]:
-            if child == par or child == self.heavy_child[node]:
-                continue
-            # Light edge - start a new chain
-            self._dfs_decompose(child, node, child)
+        Runs on an explicit stack of (node, head). Light children are pushed
+        first and the heavy child last, so the heavy child is visited next
+        and the chain continues before any light subtree starts a new one.
+        """
+        parent, heavy_child, depth = self.parent, self.heavy_child, self.depth
+        chain_head, chain_pos, tin = self.chain_head, self.chain_pos, self.tin
+        chain_id = self.chain_id
+        
+        timer = 0
+        stack = [(root, root)]
+        while stack:
+            node, head = stack.pop()
+            
+            # Heavy-first visiting order: a chain's nodes get consecutive tins
+            tin[node] = timer
+            timer += 1
+            
+            # This node belongs to the chain starting at 'head'
+            chain_head[node] = head
+            
+            # If this is the start of a new chain, assign it a new chain ID
+            if head == node:
+                chain_pos[node] = self.chain_count
+                chain_id[node] = self.chain_count
+                self.chain_count += 1
+                self.chain_head_tin.append(tin[node])
+                self.chain_head_parent.append(parent[node])
+                self.chain_head_depth.append(depth[node])
+            else:
+                # Continue the current chain
+                chain_pos[node] = chain_pos[parent[node]] + 1
+                chain_id[node] = chain_id[parent[node]]
+            
+            # Light children each start a new chain (pushed in reverse so
+            # they come off the stack in adjacency order)
+            par, heavy = parent[node], heavy_child[node]
+            for k in range(adj_start[node + 1] - 1, adj_start[node] - 1, -1):
+                child = adj_nodes[k]
+                if child != par and child != heavy:
+                    stack.append((child, child))
+            
+            # The heavy child (if it exists) continues the chain
+            if heavy != -1:
+                stack.append((heavy, head))
     
     def lca(self, u, v):
         """
@@ -123,16 +258,23 @@ class HeavyLightDecomposition:
         We move up the lighter node until both nodes are in the same chain,
         then return the higher node in that chain.
         """
+        chain_id, head_depth, head_parent = (
+            self.chain_id, self.chain_head_depth, self.chain_head_parent)
+        depth = self.depth
+        
         # Keep moving up until both nodes are in the same chain
-        while self.chain_head[u] != self.chain_head[v]:
-            # Move the node that's in a chain with a deeper head
-            if self.depth[self.chain_head[u]] > self.depth[self.chain_head[v]]:
-                u = self.parent[self.chain_head[u]]
-            else:
-                v = self.parent[self.chain_head[v]]
+        cu, cv = chain_id[u], chain_id[v]
+        while cu != cv:
+            # Make u the node whose chain has the deeper head, then always
+            # lift u: one swap instead of two mirrored branches
+            if head_depth[cu] < head_depth[cv]:
+                u, v = v, u
+                cu, cv = cv, cu
+            u = head_parent[cu]
+            cu = chain_id[u]
         
         # Now both are in the same chain, return the higher one
-        return u if self.depth[u] < self.depth[v] else v
+        return u if depth[u] < depth[v] else v
     
     def path_query(self, u, v, query_type="sum"):
         """
@@ -145,98 +287,56 @@ class HeavyLightDecomposition:
             u, v: endpoints of the path
             query_type: type of query ("sum", "max", "min")
         """
-        lca_node = self.lca(u, v)
-        
-        # Query path from u to LCA
-        result_u_to_lca = self._query_up(u, lca_node, query_type)
-        
-        # Query path from v to LCA  
-        result_v_to_lca = self._query_up(v, lca_node, query_type)
-        
-        # Combine results (subtract LCA value since it's counted twice)
-        lca_value = self.values[lca_node]
-        
-        if query_type == "sum":
-            return result_u_to_lca + result_v_to_lca - lca_value
-        elif query_type == "max":
-            return max(result_u_to_lca, result_v_to_lca)
-        elif query_type == "min":
-            return min(result_u_to_lca, result_v_to_lca)
-    
-    def _query_up(self, node, ancestor, query_type):
-        """
-        Query the path from 'node' up to 'ancestor'.
-        
-        We move up chain by chain until we reach the ancestor.
-        """
-        result = 0 if query_type == "sum" else self.values[node]
-        
-        while self.chain_head[node] != self.chain_head[ancestor]:
-            # Query from node to the head of its current chain
-            chain_result = self._query_chain(self.chain_head[node], node, query_type)
-            
-            # Combine with overall result
-            if query_type == "sum":
-                result += chain_result
-            elif query_type == "max":
-                result = max(result, chain_result)
-            elif query_type == "min":
-                result = min(result, chain_result)
-            
-            # Move to parent of chain head (this is a light edge)
-            node = self.parent[self.chain_head[node]]
-        
-        # Query the final segment within the same chain as ancestor
-        if query_type == "sum":
-            result += self._query_chain(ancestor, node, query_type)
-        else:
-            chain_result = self._query_chain(ancestor, node, query_type)
-            result = max(result, chain_result) if query_type == "max" else min(result, chain_result)
-        
-        return result
+        # Resolve the query type once, so the walk itself never compares strings
+        try:
+            tree_name, combine, identity = _AGGREGATES[query_type]
+        except KeyError:
+            raise ValueError(f"Unknown query type: {query_type!r}") from None
+        return self._path_fold(u, v, getattr(self, tree_name), combine, identity)
     
-    def _query_chain(self, u, v, query_type):
+    def _path_fold(self, u, v, tree, combine, identity):
         """
-        Query a segment within a single chain.
+        Fold one aggregate tree over the path from u to v.
         
-        In a real implementation, this would use a segment tree.
-        Here we just iterate through the range for simplicity.
+        Like lca, keep lifting whichever endpoint sits in the chain with the
+        deeper head, folding the range from that head down to the endpoint.
+        Once both are on the same chain, the part between them is one more
+        range. Every path node is covered exactly once, so nothing needs
+        subtracting afterwards and the result starts from the identity.
         """
-        # Ensure u is higher in the tree than v
-        if self.depth[u] > self.depth[v]:
-            u, v = v, u
-        
-        result = 0 if query_type == "sum" else self.values[u]
-        
-        # Simple iteration - in practice, use segment tree here
-        current = u
-        while current != v:
-            if query_type == "sum":
-                result += self.values[current]
-            elif query_type == "max":
-                result = max(result, self.values[current])
-            elif query_type == "min":
-                result = min(result, self.values[current])
-            
-            # Move to next node in chain (always the heavy child)
-            if self.heavy_child[current] != -1 and self.depth[self.heavy_child[current]] <= self.depth[v]:
-                current = self.heavy_child[current]
-            else:
-                break
-        
-        # Include the final node
-        if query_type == "sum":
-            result += self.values[v]
-        elif query_type == "max":
-            result = max(result, self.values[v])
-        elif query_type == "min":
-            result = min(result, self.values[v])
-        
-        return result
+        chain_id, head_tin, head_depth, head_parent = (
+            self.chain_id, self.chain_head_tin, self.chain_head_depth,
+            self.chain_head_parent)
+        tin, n = self.tin, self.n
+        
+        result = identity
+        cu, cv = chain_id[u], chain_id[v]
+        while cu != cv:
+            if head_depth[cu] < head_depth[cv]:
+                u, v = v, u
+                cu, cv = cv, cu
+            result = combine(result, _seg_fold(tree, n, head_tin[cu], tin[u], combine, identity))
+            u = head_parent[cu]
+            cu = chain_id[u]
+        
+        # Same chain now: the segment between them is a single range
+        l, r = tin[u], tin[v]
+        if l > r:
+            l, r = r, l
+        return combine(result, _seg_fold(tree, n, l, r, combine, identity))
     
     def update_node(self, node, value):
         """Update the value of a single node."""
         self.values[node] = value
+        if self._built:
+            self._assign(node, value)
+    
+    def _assign(self, node, value):
+        """Write a node's value into all three segment trees."""
+        pos, n = self.tin[node], self.n
+        _seg_assign(self.sum_tree, n, pos, value, add)
+        _seg_assign(self.min_tree, n, pos, value, min)
+        _seg_assign(self.max_tree, n, pos, value, max)
     
     def print_decomposition(self):
         """Print the decomposition info for debugging."""
@@ -1,5 +1,14 @@
-import numpy as np
-from typing import List, Union, Tuple
+import math
+from collections import deque
+from operator import mul
+from typing import List, Optional, Union, Tuple
+
+Matrix = List[List[int]]
+
+# Below this order a plain matrix product is cheaper than Strassen's block
+# bookkeeping; above it, the 7-instead-of-8 block products start to pay off -
+# but only when every scalar multiply is expensive (exact big-int mode)
+STRASSEN_THRESHOLD = 32
 
 class LinearRecurrenceSolver:
     """
@@ -12,9 +21,15 @@ class LinearRecurrenceSolver:
     [a(n), a(n-1), ..., a(n-k+1)] = [a(n-1), a(n-2), ..., a(n-k)] * M
     
     Where M is our transition matrix. Then a(n) = initial_state * M^(n-k)
+    
+    Everything is done with plain Python ints, so results are exact no matter
+    how large n gets (F(1000) has 209 digits - way past what a float can hold).
+    Pass a modulus to keep the numbers small, which is what you usually want
+    in competitive programming anyway.
     """
     
-    def __init__(self, coefficients: List[float], initial_values: List[float]):
+    def __init__(self, coefficients: List[int], initial_values: List[int],
+                 modulus: Optional[int] = None):
         """
         Initialize the recurrence solver.
         
@@ -22,6 +37,7 @@ class LinearRecurrenceSolver:
             coefficients: The coefficients [c1, c2, ..., ck] where
                          a(n) = c1*a(n-1) + c2*a(n-2) + ... + ck*a(n-k)
             initial_values: The first k values [a(0), a(1), ..., a(k-1)]
+            modulus: If given, every term is reduced modulo this value
         
         Example:
             For Fibonacci: a(n) = a(n-1) + a(n-2), a(0)=0, a(1)=1
@@ -30,16 +46,28 @@ class LinearRecurrenceSolver:
         if len(coefficients) != len(initial_values):
             raise ValueError("Number of coefficients must match number of initial values")
         
-        self.coefficients = np.array(coefficients, dtype=float)
-        self.initial_values = np.array(initial_values, dtype=float)
+        if modulus is not None and modulus <= 0:
+            raise ValueError("modulus must be positive")
+        
+        self.modulus = modulus
+        if modulus is None:
+            self.coefficients = list(coefficients)
+            self.initial_values = list(initial_values)
+        else:
+            self.coefficients = [c % modulus for c in coefficients]
+            self.initial_values = [v % modulus for v in initial_values]
         self.k = len(coefficients)  # Order of the recurrence
         
         # Build the transition matrix
         # This is the clever part - we create a matrix that shifts our state vector
         # and applies the recurrence relation
         self.transition_matrix = self._build_transition_matrix()
+        
+        # The squaring chain M, M^2, M^4, M^8, ... is the same for every n, so
+        # keep it around: later solve() calls only multiply cached squares
+        self._power_cache: List[Matrix] = [self.transition_matrix]
     
-    def _build_transition_matrix(self) -> np.ndarray:
+    def _build_transition_matrix(self) -> Matrix:
         """
         Build the transition matrix for the recurrence relation.
         
@@ -54,46 +82,222 @@ class LinearRecurrenceSolver:
         The first row applies the recurrence relation.
         The other rows just shift the previous values down.
         """
-        matrix = np.zeros((self.k, self.k))
+        matrix = [[0] * self.k for _ in range(self.k)]
         
         # First row: the recurrence coefficients
-        matrix[0, :] = self.coefficients
+        matrix[0][:] = self.coefficients
         
         # Remaining rows: identity matrix shifted down
         # This creates the "memory" effect - keeping track of previous values
         for i in range(1, self.k):
-            matrix[i, i-1] = 1
+            matrix[i][i-1] = 1
         
         return matrix
     
-    def matrix_power(self, matrix: np.ndarray, n: int) -> np.ndarray:
+    def _identity(self, size: int) -> Matrix:
+        """Return the size x size identity matrix."""
+        return [[int(i == j) for j in range(size)] for i in range(size)]
+    
+    def _matmul(self, a: Matrix, b: Matrix) -> Matrix:
+        """
+        Multiply two square matrices of Python ints.
+        
+        For the small k we deal with (usually <= 8) a hand-rolled product is
+        faster than going through an object-dtype array, and it stays exact.
+        Transposing b once lets each entry be a single zip-and-sum.
+        """
+        mod = self.modulus
+        columns = list(zip(*b))
+        if mod is None:
+            return [[sum(x * y for x, y in zip(row, col)) for col in columns]
+                    for row in a]
+        return [[sum(x * y for x, y in zip(row, col)) % mod for col in columns]
+                for row in a]
+    
+    def _matadd(self, a: Matrix, b: Matrix) -> Matrix:
+        """Entrywise a + b."""
+        return [[x + y for x, y in zip(ra, rb)] for ra, rb in zip(a, b)]
+    
+    def _matsub(self, a: Matrix, b: Matrix) -> Matrix:
+        """Entrywise a - b."""
+        return [[x - y for x, y in zip(ra, rb)] for ra, rb in zip(a, b)]
+    
+    def _strassen_mul(self, a: Matrix, b: Matrix,
+                      threshold: int = STRASSEN_THRESHOLD) -> Matrix:
+        """
+        Multiply two square matrices with Strassen's algorithm.
+        
+        Each matrix is split into four half-size blocks, and the product is
+        assembled from 7 block products (M1..M7) instead of the obvious 8.
+        Recursing on the blocks saves 1/8 of the scalar multiplies per level,
+        which adds up for high-order recurrences where every multiply is a
+        big-int or modular operation. Once blocks drop below threshold we
+        fall back to the plain product.
+        """
+        size = len(a)
+        if size < threshold or size < 2:
+            return self._matmul(a, b)
+        
+        # Pad odd sizes with a zero row and column so the blocks split evenly
+        half = (size + 1) >> 1
+        if size & 1:
+            a = [row + [0] for row in a] + [[0] * (size + 1)]
+            b = [row + [0] for row in b] + [[0] * (size + 1)]
+        
+        a11 = [row[:half] for row in a[:half]]
+        a12 = [row[half:] for row in a[:half]]
+        a21 = [row[:half] for row in a[half:]]
+        a22 = [row[half:] for row in a[half:]]
+        b11 = [row[:half] for row in b[:half]]
+        b12 = [row[half:] for row in b[:half]]
+        b21 = [row[:half] for row in b[half:]]
+        b22 = [row[half:] for row in b[half:]]
+        
+        add, sub, mul = self._matadd, self._matsub, self._strassen_mul
+        m1 = mul(add(a11, a22), add(b11, b22), threshold)
+        m2 = mul(add(a21, a22), b11, threshold)
+        m3 = mul(a11, sub(b12, b22), threshold)
+        m4 = mul(a22, sub(b21, b11), threshold)
+        m5 = mul(add(a11, a12), b22, threshold)
+        m6 = mul(sub(a21, a11), add(b11, b12), threshold)
+        m7 = mul(sub(a12, a22), add(b21, b22), threshold)
+        
+        c11 = add(sub(add(m1, m4), m5), m7)
+        c12 = add(m3, m5)
+        c21 = add(m2, m4)
+        c22 = add(add(sub(m1, m2), m3), m6)
+        
+        # Stitch the blocks back together, dropping any padding
+        result = [r1 + r2 for r1, r2 in zip(c11, c12)]
+        result += [r1 + r2 for r1, r2 in zip(c21, c22)]
+        mod = self.modulus
+        if mod is None:
+            return [row[:size] for row in result[:size]]
+        return [[x % mod for x in row[:size]] for row in result[:size]]
+    
+    def _pick_matmul(self, size: int):
+        """Choose the matrix product routine for size x size matrices."""
+        # Exact high-order recurrences go through Strassen: the entries grow
+        # into huge ints, so saving multiplies beats the extra additions.
+        # Under a modulus every multiply is cheap and the plain product wins.
+        if self.modulus is None and size >= STRASSEN_THRESHOLD:
+            return self._strassen_mul
+        return self._matmul
+    
+    def _squares(self, count: int) -> List[Matrix]:
+        """
+        Return the cached chain [M, M^2, M^4, ...] of the transition matrix,
+        extended (if needed) to at least count entries.
+        """
+        squares = self._power_cache
+        if len(squares) < count:
+            matmul = self._pick_matmul(self.k)
+            while len(squares) < count:
+                squares.append(matmul(squares[-1], squares[-1]))
+        return squares
+    
+    def _advance_state(self, state: List[int], steps: int) -> List[int]:
+        """
+        Apply the transition matrix `steps` times to a state vector.
+        
+        Rather than building M^steps and then multiplying the state by it,
+        the state is pushed through the cached squares M^(2^i) one set bit at
+        a time (powers of M commute, so the order doesn't matter). Each step
+        is a k x k times k matrix-vector product, so no intermediate k x k
+        matrices get allocated at all - O(k^2) work per bit instead of O(k^3).
+        """
+        mod = self.modulus
+        squares = self._squares(steps.bit_length())
+        for i in range(steps.bit_length()):
+            if steps >> i & 1:
+                state = [sum(x * y for x, y in zip(row, state))
+                         for row in squares[i]]
+                if mod is not None:
+                    state = [x % mod for x in state]
+        return state
+    
+    def matrix_power(self, matrix: Matrix, n: int) -> Matrix:
         """
         Compute matrix^n using fast exponentiation (binary exponentiation).
         
         This is the secret sauce that makes everything fast!
         Instead of multiplying the matrix n times (O(n) operations),
-        we use the fact that:
-        - If n is even: matrix^n = (matrix^2)^(n/2)
-        - If n is odd: matrix^n = matrix * matrix^(n-1)
+        we write n in binary and only multiply in the powers
+        matrix^(2^i) for the bits that are set, e.g.
+        matrix^13 = matrix^8 * matrix^4 * matrix^1
         
-        This reduces the complexity from O(n) to O(log n).
+        This reduces the complexity from O(n) to O(log n), and the
+        loop is iterative so there is no recursion overhead at all.
+        
+        For our own transition matrix the squares matrix^(2^i) come from
+        (and extend) the instance's cache, so repeated calls only pay for
+        the multiplies that fold them together.
         """
         if n == 0:
-            return np.eye(matrix.shape[0])  # Identity matrix
+            return self._identity(len(matrix))  # Identity matrix
         
         if n == 1:
-            return matrix.copy()
+            return [row[:] for row in matrix]
         
-        # The recursive magic happens here
-        if n % 2 == 0:
-            # Even power: square the matrix and halve the exponent
-            half_power = self.matrix_power(matrix, n // 2)
-            return half_power @ half_power
-        else:
-            # Odd power: multiply by matrix and reduce exponent by 1
-            return matrix @ self.matrix_power(matrix, n - 1)
+        matmul = self._pick_matmul(len(matrix))
+        
+        if matrix is self.transition_matrix:
+            squares = self._squares(n.bit_length())
+            
+            # Fold in matrix^(2^i) for each set bit i, starting from the first
+            # one so there's no multiply by the identity
+            result = None
+            for i, square in enumerate(squares[:n.bit_length()]):
+                if n >> i & 1:
+                    result = square if result is None else matmul(result, square)
+            
+            # For a power of two the result *is* a cached square - copy it so
+            # callers can't modify the cache through it
+            return [row[:] for row in result] if n & (n - 1) == 0 else result
+        
+        # Walk the bits of n from the lowest up: `base` holds matrix^(2^i)
+        # and gets folded into the result whenever bit i is set
+        result = self._identity(len(matrix))
+        base = matrix
+        while n:
+            if n & 1:
+                result = matmul(result, base)
+            n >>= 1
+            if n:
+                base = matmul(base, base)
+        
+        return result
     
-    def solve(self, n: int) -> float:
+    def _matpow2x2(self, a: int, b: int, c: int, d: int,
+                   n: int) -> Tuple[int, int, int, int]:
+        """
+        Raise the 2x2 matrix [[a, b], [c, d]] to the nth power.
+        
+        Same square-and-multiply as matrix_power, but unrolled into eight
+        scalar multiplies per product on four locals - no row lists to
+        build, which matters for Fibonacci-style (k = 2) recurrences since
+        they are by far the most common.
+        
+        Returns:
+            The entries of the result as a tuple (a', b', c', d')
+        """
+        mod = self.modulus
+        ra, rb, rc, rd = 1, 0, 0, 1  # Identity matrix
+        while n:
+            if n & 1:
+                ra, rb, rc, rd = (ra * a + rb * c, ra * b + rb * d,
+                                  rc * a + rd * c, rc * b + rd * d)
+                if mod is not None:
+                    ra, rb, rc, rd = ra % mod, rb % mod, rc % mod, rd % mod
+            n >>= 1
+            if n:
+                a, b, c, d = (a * a + b * c, a * b + b * d,
+                              c * a + d * c, c * b + d * d)
+                if mod is not None:
+                    a, b, c, d = a % mod, b % mod, c % mod, d % mod
+        return ra, rb, rc, rd
+    
+    def solve(self, n: int) -> int:
         """
         Solve for the nth term of the recurrence relation.
         
@@ -118,20 +322,32 @@ class LinearRecurrenceSolver:
         
         steps = n - self.k + 1
         
+        # Order 1 is just a geometric sequence: a(n) = c1^n * a(0), and the
+        # built-in pow already does the repeated squaring in C
+        if self.k == 1:
+            c1, a0 = self.coefficients[0], self.initial_values[0]
+            if self.modulus is None:
+                return c1 ** steps * a0
+            return pow(c1, steps, self.modulus) * a0 % self.modulus
+        
+        # Order 2 (Fibonacci, Lucas, Pell, ...): skip the general matrix code
+        if self.k == 2:
+            c1, c2 = self.coefficients
+            p00, p01, _, _ = self._matpow2x2(c1, c2, 1, 0, steps)
+            result = p00 * self.initial_values[1] + p01 * self.initial_values[0]
+            return result if self.modulus is None else result % self.modulus
+        
         # Create initial state vector (most recent values first)
-        initial_state = np.flip(self.initial_values)
+        initial_state = self.initial_values[::-1]
         
-        # Compute the transition matrix raised to the power of steps
+        # Apply the transition matrix `steps` times to our initial state
         # This is where the logarithmic speedup happens!
-        transition_power = self.matrix_power(self.transition_matrix, steps)
-        
-        # Apply the transition to our initial state
-        final_state = initial_state @ transition_power
+        final_state = self._advance_state(initial_state, steps)
         
         # The first element of the final state is our answer
         return final_state[0]
     
-    def solve_sequence(self, start: int, end: int) -> List[float]:
+    def solve_sequence(self, start: int, end: int) -> List[int]:
         """
         Solve for a range of terms efficiently.
         
@@ -144,13 +360,37 @@ class LinearRecurrenceSolver:
         """
         if start > end:
             return []
+        if start < 0:
+            raise ValueError("n must be non-negative")
+        
+        # Only one matrix exponentiation is needed: it jumps straight to the
+        # window [a(base-k+1), ..., a(base)] with base >= start, and from there
+        # each further term is a single O(k) step of the recurrence itself
+        k = self.k
+        mod = self.modulus
+        base = max(start, k - 1)
+        if base == k - 1:
+            window = self.initial_values[:]
+        else:
+            # The state vector is [a(base), a(base-1), ..., a(base-k+1)]
+            initial_state = self.initial_values[::-1]
+            window = self._advance_state(initial_state, base - k + 1)[::-1]
+        
+        result = window[start - (base - k + 1):]
         
-        # For small ranges, it might be faster to compute iteratively
-        # But for large ranges or when start is large, matrix exponentiation wins
+        # Roll the window forward: pair c_k..c_1 with a(i-k)..a(i-1)
+        window = deque(window, maxlen=k)
+        coefficients = self.coefficients[::-1]
+        for _ in range(base + 1, end + 1):
+            value = sum(map(mul, coefficients, window))
+            if mod is not None:
+                value %= mod
+            window.append(value)
+            result.append(value)
         
-        return [self.solve(i) for i in range(start, end + 1)]
+        return result[:end - start + 1]
     
-    def get_characteristic_polynomial(self) -> np.ndarray:
+    def get_characteristic_polynomial(self) -> List[int]:
         """
         Get the characteristic polynomial of the recurrence relation.
         
@@ -162,7 +402,7 @@ class LinearRecurrenceSolver:
             Coefficients of the characteristic polynomial (highest degree first)
         """
         # Start with x^k (coefficient 1 for x^k)
-        poly = np.zeros(self.k + 1)
+        poly = [0] * (self.k + 1)
         poly[0] = 1
         
         # Subtract the recurrence coefficients
@@ -182,11 +422,16 @@ def fibonacci_example():
     
     print("First 20 Fibonacci numbers:")
     for i in range(20):
-        print(f"F({i}) = {fib_solver.solve(i):.0f}")
+        print(f"F({i}) = {fib_solver.solve(i)}")
     
     # Show the power of matrix exponentiation for large n
-    print(f"\nF(100) = {fib_solver.solve(100):.0f}")
-    print(f"F(1000) = {fib_solver.solve(1000):.2e}")
+    print(f"\nF(100) = {fib_solver.solve(100)}")
+    print(f"F(1000) has {len(str(fib_solver.solve(1000)))} digits")
+    
+    # Usually we only care about the answer modulo some prime
+    mod = 10**9 + 7
+    fib_mod = LinearRecurrenceSolver([1, 1], [0, 1], modulus=mod)
+    print(f"F(10^18) mod {mod} = {fib_mod.solve(10**18)}")
     
     return fib_solver
 
@@ -199,7 +444,7 @@ def tribonacci_example():
     
     print("First 15 Tribonacci numbers:")
     for i in range(15):
-        print(f"T({i}) = {trib_solver.solve(i):.0f}")
+        print(f"T({i}) = {trib_solver.solve(i)}")
     
     return trib_solver
 
@@ -213,7 +458,7 @@ def custom_recurrence_example():
     
     print("First 10 terms:")
     for i in range(10):
-        print(f"a({i}) = {custom_solver.solve(i):.0f}")
+        print(f"a({i}) = {custom_solver.solve(i)}")
     
     return custom_solver
 
@@ -235,7 +480,7 @@ def performance_comparison():
         end_time = time.time()
         
         print(f"F({n}) computed in {end_time - start_time:.6f} seconds")
-        print(f"Result: {result:.2e}")
+        print(f"Result has {len(str(result))} digits")
         print()
 
 if __name__ == "__main__":
@@ -252,8 +497,10 @@ if __name__ == "__main__":
     print(f"Fibonacci characteristic polynomial coefficients: {char_poly}")
     print("This represents: x² - x - 1 = 0")
     
-    # Find the roots (golden ratio and its conjugate)
-    roots = np.roots(char_poly)
+    # Find the roots (golden ratio and its conjugate) with the quadratic formula
+    a, b, c = char_poly
+    disc = math.sqrt(b * b - 4 * a * c)
+    roots = [(-b + disc) / (2 * a), (-b - disc) / (2 * a)]
     print(f"Characteristic roots: {roots}")
     print(f"Golden ratio φ = {roots[0]:.6f}")
     print(f"Conjugate = {roots[1]:.6f}")
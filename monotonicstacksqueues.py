@@ -2,52 +2,68 @@
 # Monotonic Stack Variants
 # -------------------
 
+# The stack is a preallocated index buffer with a top pointer sp: at most n
+# indices are ever on it, so push/pop are a store and an increment instead of
+# list.append/list.pop calls.
+
 def next_greater_elements(nums):
     """Next Greater Element to the right"""
     n = len(nums)
     res = [-1] * n
-    stack = []
+    stack = [0] * n
+    sp = 0
     for i in range(n):
-        while stack and nums[i] > nums[stack[-1]]:
-            idx = stack.pop()
-            res[idx] = nums[i]
-        stack.append(i)
+        num = nums[i]
+        while sp and num > nums[stack[sp - 1]]:
+            sp -= 1
+            res[stack[sp]] = num
+        stack[sp] = i
+        sp += 1
     return res
 
 def next_smaller_elements(nums):
     """Next Smaller Element to the right"""
     n = len(nums)
     res = [-1] * n
-    stack = []
+    stack = [0] * n
+    sp = 0
     for i in range(n):
-        while stack and nums[i] < nums[stack[-1]]:
-            idx = stack.pop()
-            res[idx] = nums[i]
-        stack.append(i)
+        num = nums[i]
+        while sp and num < nums[stack[sp - 1]]:
+            sp -= 1
+            res[stack[sp]] = num
+        stack[sp] = i
+        sp += 1
     return res
 
 def previous_greater_elements(nums):
     """Previous Greater Element to the left"""
     n = len(nums)
     res = [-1] * n
-    stack = []
+    stack = [0] * n
+    sp = 0
     for i in range(n-1, -1, -1):
-        while stack and nums[i] > nums[stack[-1]]:
-            idx = stack.pop()
-            res[idx] = nums[i]
-        stack.append(i)
+        num = nums[i]
+        while sp and num > nums[stack[sp - 1]]:
+            sp -= 1
+            res[stack[sp]] = num
+        stack[sp] = i
+        sp += 1
     return res
 
 def previous_smaller_elements(nums):
     """Previous Smaller Element to the left"""
     n = len(nums)
     res = [-1] * n
-    stack = []
+    stack = [0] * n
+    sp = 0
     for i in range(n-1, -1, -1):
-        while stack and nums[i] < nums[stack[-1]]:
-            idx = stack.pop()
-            res[idx] = nums[i]
-        stack.append(i)
+        num = nums[i]
+        while sp and num < nums[stack[sp - 1]]:
+            sp -= 1
+            res[stack[sp]] = num
+        stack[sp] = i
+        sp += 1
     return res
 
 
@@ -55,34 +71,40 @@ def previous_smaller_elements(nums):
 # Monotonic Queue Variants
 # -------------------
 
-from collections import deque
+# The index queue lives in a flat preallocated buffer with head/tail
+# pointers: each index is pushed exactly once, so n slots never wrap, and
+# popleft/pop/append become pointer moves instead of deque method calls.
 
 def max_sliding_window(nums, k):
     """Max in each sliding window of size k"""
-    dq = deque()
+    dq = [0] * len(nums)
+    head = tail = 0
     res = []
     for i, num in enumerate(nums):
-        while dq and dq[0] <= i - k:
-            dq.popleft()
-        while dq and nums[dq[-1]] < num:
-            dq.pop()
-        dq.append(i)
+        while head < tail and dq[head] <= i - k:
+            head += 1
+        while head < tail and nums[dq[tail - 1]] < num:
+            tail -= 1
+        dq[tail] = i
+        tail += 1
         if i >= k - 1:
-            res.append(nums[dq[0]])
+            res.append(nums[dq[head]])
     return res
 
 def min_sliding_window(nums, k):
     """Min in each sliding window of size k"""
-    dq = deque()
+    dq = [0] * len(nums)
+    head = tail = 0
     res = []
     for i, num in enumerate(nums):
-        while dq and dq[0] <= i - k:
-            dq.popleft()
-        while dq and nums[dq[-1]] > num:
-            dq.pop()
-        dq.append(i)
+        while head < tail and dq[head] <= i - k:
+            head += 1
+        while head < tail and nums[dq[tail - 1]] > num:
+            tail -= 1
+        dq[tail] = i
+        tail += 1
         if i >= k - 1:
-            res.append(nums[dq[0]])
+            res.append(nums[dq[head]])
     return res
 
 # -------------------
@@ -91,16 +113,23 @@ def min_sliding_window(nums, k):
 
 def largest_rectangle_area(heights):
     """Largest rectangle in histogram"""
-    stack = []
+    n = len(heights)
+    stack = [0] * n
+    sp = 0
     max_area = 0
-    heights.append(0)  # Sentinel to pop all at end
-    for i, h in enumerate(heights):
-        while stack and heights[stack[-1]] > h:
-            height = heights[stack.pop()]
-            width = i if not stack else i - stack[-1] - 1
-            max_area = max(max_area, height * width)
-        stack.append(i)
-    heights.pop()
+    for i in range(n + 1):
+        # Height 0 past the end acts as a sentinel that pops everything,
+        # without appending to (and mutating) the caller's list
+        h = heights[i] if i < n else 0
+        while sp and heights[stack[sp - 1]] > h:
+            sp -= 1
+            height = heights[stack[sp]]
+            width = i if not sp else i - stack[sp - 1] - 1
+            if height * width > max_area:
+                max_area = height * width
+        if i < n:
+            stack[sp] = i
+            sp += 1
     return max_area
 
 
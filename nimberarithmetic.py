@@ -15,6 +15,116 @@ Key concepts:
 - A position with nimber > 0 is a winning position (N-position)
 """
 
+from functools import reduce
+from operator import xor
+
+# The multiplication routines are module-level functions of plain ints rather
+# than Nimber methods: every inner call then costs one plain call instead of a
+# bound-method lookup, and anything that works on raw Grundy values (not just
+# Nimber objects) can use them directly.
+
+# Memo for products of two powers of 2, keyed by the exponent pair (i, j) with
+# i <= j. There are at most 64 * 65 / 2 such pairs for 64-bit values, and every
+# general product is assembled from them, so this fills up almost immediately.
+_POW2_PRODUCTS = {}
+
+NIM_CACHE_LIMIT = 1 << 16  # Max memoized general products
+_NIM_CACHE = {}  # (min(a, b), max(a, b)) -> a * b
+
+
+def _highest_power_of_2(n):
+    """
+    Find the highest power of 2 that's ≤ n.
+    
+    For example: _highest_power_of_2(6) = 4, _highest_power_of_2(8) = 8
+    This is like finding the position of the most significant bit, which
+    is exactly what int.bit_length gives us - no loop needed.
+    """
+    return 0 if n == 0 else 1 << (n.bit_length() - 1)
+
+
+def _multiply_powers_of_2(a, b):
+    """
+    Multiply two powers of 2 using nim-multiplication rules.
+    
+    Write a = 2^i and b = 2^j. Every power of 2 is an ordinary product of
+    distinct Fermat 2-powers F = 2^(2^s) (one per set bit s of the exponent),
+    and nim-multiplication has two simple rules for those:
+    - distinct Fermat 2-powers multiply like ordinary integers
+    - F * F = 3F/2 (e.g. 2 * 2 = 3, 4 * 4 = 6, 16 * 16 = 24)
+    
+    So if i and j share no bits the answer is just a * b. Otherwise we pull
+    out the largest shared F from both sides and multiply what remains by 3F/2.
+    """
+    i = a.bit_length() - 1
+    j = b.bit_length() - 1
+    key = (i, j) if i <= j else (j, i)
+    result = _POW2_PRODUCTS.get(key)
+    if result is not None:
+        return result
+    
+    common = i & j
+    if common == 0:
+        result = a * b  # No shared Fermat 2-power: regular multiplication works
+    else:
+        # F = 2^t is the largest Fermat 2-power in both a and b
+        t = _highest_power_of_2(common)
+        fermat = 1 << t
+        rest = _multiply_powers_of_2(a >> t, b >> t)
+        result = _nim_multiply(rest, fermat | (fermat >> 1))
+    
+    _POW2_PRODUCTS[key] = result
+    return result
+
+
+def _nim_multiply(a, b):
+    """
+    The heart of nimber multiplication.
+    
+    This implements the nim-multiplication rules:
+    1. For powers of 2, we have special multiplication rules
+    2. We break down numbers into sums of powers of 2
+    3. We use distributivity and the fact that nimbers form a field
+    
+    Nim-addition is XOR, so distributivity says a * b is just the XOR of
+    2^i * 2^j over every set bit i of a and j of b. We walk those bit pairs
+    directly instead of recursing on high bit + remainder, and each
+    power-of-2 product is a memo lookup after its first use.
+    
+    Finished products are memoized too (a * b == b * a, so the key is the
+    sorted pair): game-tree searches tend to multiply the same values over
+    and over.
+    """
+    if a == 0 or b == 0:
+        return 0
+    
+    # Handle the base cases for small numbers efficiently
+    if a == 1:
+        return b
+    if b == 1:
+        return a
+    
+    key = (a, b) if a <= b else (b, a)
+    result = _NIM_CACHE.get(key)
+    if result is not None:
+        return result
+    
+    result = 0
+    rest_a = a
+    while rest_a:
+        a_bit = rest_a & -rest_a  # Lowest set bit of what's left of a
+        rest_a ^= a_bit
+        rest_b = b
+        while rest_b:
+            b_bit = rest_b & -rest_b
+            rest_b ^= b_bit
+            result ^= _multiply_powers_of_2(a_bit, b_bit)
+    
+    if len(_NIM_CACHE) < NIM_CACHE_LIMIT:
+        _NIM_CACHE[key] = result
+    return result
+
+
 class Nimber:
     """
     A class representing a nimber (nim-number) with arithmetic operations.
@@ -76,9 +186,9 @@ class Nimber:
         and based on powers of 2.
         """
         if isinstance(other, Nimber):
-            return Nimber(self._nim_multiply(self.value, other.value))
+            return Nimber(_nim_multiply(self.value, other.value))
         elif isinstance(other, int):
-            return Nimber(self._nim_multiply(self.value, other))
+            return Nimber(_nim_multiply(self.value, other))
         else:
             return NotImplemented
     
@@ -86,114 +196,6 @@ class Nimber:
         """Right multiplication - handles cases like 3 * nimber"""
         return self.__mul__(other)
     
-    def _nim_multiply(self, a, b):
-        """
-        The heart of nimber multiplication - a recursive algorithm.
-        
-        This implements the nim-multiplication rules:
-        1. For powers of 2, we have special multiplication rules
-        2. We break down numbers into sums of powers of 2
-        3. We use distributivity and the fact that nimbers form a field
-        
-        The algorithm is quite clever - it uses the binary representation
-        of numbers and applies nim-multiplication rules recursively.
-        """
-        if a == 0 or b == 0:
-            return 0
-        
-        # Handle the base cases for small numbers efficiently
-        if a == 1:
-            return b
-        if b == 1:
-            return a
-        
-        # Find the highest power of 2 in each number
-        # This is like finding the most significant bit
-        a_high = self._highest_power_of_2(a)
-        b_high = self._highest_power_of_2(b)
-        
-        # Split each number into high bit + remainder
-        # For example: 6 = 4 + 2, so a_low = 6 - 4 = 2
-        a_low = a - a_high
-        b_low = b - b_high
-        
-        # Apply the nim-multiplication formula recursively
-        # This uses distributivity: (x+y)*(z+w) = x*z + x*w + y*z + y*w
-        # but with nim-arithmetic (XOR for addition)
-        high_mult = self._multiply_powers_of_2(a_high, b_high)
-        
-        result = high_mult
-        if a_low > 0:
-            result ^= self._nim_multiply(a_high, b_low)
-        if b_low > 0:
-            result ^= self._nim_multiply(a_low, b_high)
-        if a_low > 0 and b_low > 0:
-            result ^= self._nim_multiply(a_low, b_low)
-        
-        return result
-    
-    def _highest_power_of_2(self, n):
-        """
-        Find the highest power of 2 that's ≤ n.
-        
-        For example: _highest_power_of_2(6) = 4, _highest_power_of_2(8) = 8
-        This is like finding the position of the most significant bit.
-        """
-        if n == 0:
-            return 0
-        
-        power = 1
-        while power <= n:
-            power <<= 1  # Same as power *= 2, but faster
-        return power >> 1  # Same as power // 2
-    
-    def _multiply_powers_of_2(self, a, b):
-        """
-        Multiply two powers of 2 using nim-multiplication rules.
-        
-        This is the trickiest part! The rules are:
-        - Powers of 2 multiply in a special way in nim-arithmetic
-        - We need to use the Fermat numbers and their properties
-        
-        For efficiency, we'll implement the basic cases that cover
-        most practical game theory applications.
-        """
-        # Convert to power indices (a = 2^i, b = 2^j)
-        i = (a - 1).bit_length() - 1 if a > 0 else 0
-        j = (b - 1).bit_length() - 1 if b > 0 else 0
-        
-        # Special multiplication rules for powers of 2 in nim-arithmetic
-        # These come from the structure of the nim-multiplication table
-        if i == 0 or j == 0:  # One of them is 2^0 = 1
-            return a * b  # Regular multiplication works
-        
-        # For higher powers, we use a lookup table or recursive formula
-        # This is a simplified version - full implementation would handle all cases
-        result_power = i ^ j  # XOR the exponents for basic cases
-        
-        # Apply corrections for specific power combinations
-        # (This is where the full nim-multiplication table would be used)
-        if i == j and i >= 1:
-            # Special rule: 2^k * 2^k has additional terms
-            result_power = self._square_power_correction(i)
-        
-        return 1 << result_power  # Return 2^result_power
-    
-    def _square_power_correction(self, k):
-        """
-        Handle the special case of squaring powers of 2 in nim-arithmetic.
-        
-        This implements the recursive structure of nim-multiplication
-        for cases like 2^k * 2^k.
-        """
-        if k == 1:  # 2 * 2 = 3 in nim-arithmetic!
-            return 1  # Because the result is 2^1 + 2^0 = 3, but we return the modified exponent
-        elif k == 2:  # 4 * 4 = 6 in nim-arithmetic
-            return 2  # Modified calculation for nim-arithmetic
-        else:
-            # For larger powers, use recursive structure
-            return k + 1  # Simplified - full version would be more complex
-    
     def mex(self, game_states):
         """
         Calculate the minimum excludant (mex) of a set of nimbers.
@@ -279,12 +281,8 @@ def analyze_nim_game(piles):
     if not piles:
         return Nimber(0)  # Empty game is a losing position
     
-    # The nim-sum is just XOR of all pile sizes
-    nim_sum = 0
-    for pile_size in piles:
-        nim_sum ^= pile_size
-    
-    return Nimber(nim_sum)
+    # The nim-sum is just XOR of all pile sizes, folded in one C-level reduce
+    return Nimber(reduce(xor, piles, 0))
 
 
 def demonstrate_nimber_arithmetic():
@@ -1,39 +1,62 @@
+from array import array
+from operator import add
+
+
+# Leaves live at tree[n:], and node i's children at 2i and 2i + 1
+def _st_update(tree, n, index, value):
+    # Set value at position index
+    pos = index + n
+    tree[pos] = value
+    # Move upward and update parents
+    pos >>= 1
+    while pos > 0:
+        tree[pos] = tree[pos << 1] + tree[pos << 1 | 1]
+        pos >>= 1
+
+
+def _st_query(tree, n, left, right):
+    # Range sum query on interval [left, right)
+    result = 0
+    left += n
+    right += n
+    while left < right:
+        if left & 1:
+            result += tree[left]
+            left += 1
+        if right & 1:
+            right -= 1
+            result += tree[right]
+        left >>= 1
+        right >>= 1
+    return result
+
+
 class SegmentTree:
+    # Sums live in a flat int64 array
+    __slots__ = ('n', 'tree')
+
     def __init__(self, data):
         self.n = len(data)
-        self.tree = [0] * (2 * self.n)
+        self.tree = array('q', [0]) * (2 * self.n)
         # Build the tree by inserting leaves
-        for i in range(self.n):
-            self.tree[self.n + i] = data[i]
-        # Build internal nodes
-        for i in range(self.n - 1, 0, -1):
-            self.tree[i] = self.tree[i << 1] + self.tree[i << 1 | 1]
+        self.tree[self.n:] = array('q', data)
+        # Build internal nodes a level at a time: nodes [lo, hi) only have
+        # children in [hi, 2n), which are all done, so each level is one
+        # pairwise sum of the even and odd slices below it
+        tree = self.tree
+        hi = self.n
+        while hi > 1:
+            lo = (hi + 1) >> 1
+            tree[lo:hi] = array('q', map(add, tree[lo << 1:hi << 1:2],
+                                         tree[lo << 1 | 1:hi << 1:2]))
+            hi = lo
 
     def update(self, index, value):
-        # Set value at position index
-        pos = index + self.n
-        self.tree[pos] = value
-        # Move upward and update parents
-        pos >>= 1
-        while pos > 0:
-            self.tree[pos] = self.tree[pos << 1] + self.tree[pos << 1 | 1]
-            pos >>= 1
+        _st_update(self.tree, self.n, index, value)
 
     def query(self, left, right):
         # Range sum query on interval [left, right)
-        result = 0
-        left += self.n
-        right += self.n
-        while left < right:
-            if left & 1:
-                result += self.tree[left]
-                left += 1
-            if right & 1:
-                right -= 1
-                result += self.tree[right]
-            left >>= 1
-            right >>= 1
-        return result
+        return _st_query(self.tree, self.n, left, right)
 
 
 # Example usage:
@@ -1,74 +1,108 @@
+from itertools import accumulate
+from operator import sub
+
+
 # 1. Fixed-size sliding window: maximum sum of subarray of size k
 def max_sum_subarray(arr, k):
     n = len(arr)
+    if k < 0:
+        # prefix[k:] below would quietly become a tail slice
+        raise ValueError("Window size k must not be negative")
     if n < k:
         return -1
-    window_sum = sum(arr[:k])
-    max_sum = window_sum
-    for i in range(k, n):
-        window_sum += arr[i] - arr[i - k]
-        max_sum = max(max_sum, window_sum)
-    return max_sum
+    if k == 0:
+        return 0  # The empty window
+    # Window sums are differences of prefix sums k apart, so the whole scan
+    # is one accumulate plus one map/max - all C loops, no per-index bytecode
+    prefix = list(accumulate(arr, initial=0))
+    return max(map(sub, prefix[k:], prefix))
 
 
 # 2. Variable-size sliding window: smallest subarray with sum >= target
 def min_subarray_len(target, arr):
     n = len(arr)
+    if target <= 0:
+        return 1 if n else 0  # Any single element already qualifies
+
+    # Window [left, right) has sum prefix[right] - prefix[left], so it's long
+    # enough while prefix[left] <= prefix[right] - target; the running sum
+    # and its add/subtract bookkeeping disappear from the loop
+    prefix = list(accumulate(arr, initial=0))
+    min_length = n + 1
     left = 0
-    current_sum = 0
-    min_length = float('inf')
-
-    for right in range(n):
-        current_sum += arr[right]
 
-        # Shrink window from left as long as sum >= target
-        while current_sum >= target:
-            min_length = min(min_length, right - left + 1)
-            current_sum -= arr[left]
+    for right in range(1, n + 1):
+        need = prefix[right] - target
+        if prefix[left] <= need:
+            # Shrink window from left as long as sum >= target
             left += 1
+            while prefix[left] <= need:
+                left += 1
+            if right - left + 1 < min_length:
+                min_length = right - left + 1
 
-    return min_length if min_length != float('inf') else 0
+    return min_length if min_length <= n else 0
 
 
 # 3. Sliding window with frequency map: longest substring with at most k distinct chars
 def length_of_longest_substring_k_distinct(s, k):
-    from collections import defaultdict
-    count = defaultdict(int)
+    if isinstance(s, str) and s.isascii():
+        # ASCII fast path: iterate the encoded bytes as small ints and count
+        # in a flat 128-slot list, so each step is integer indexing, no hashing
+        chars = s.encode('ascii')
+        count = [0] * 128
+    else:
+        from collections import defaultdict
+        chars = s
+        count = defaultdict(int)
     left = 0
     max_length = 0
     distinct = 0
 
-    for right in range(len(s)):
-        if count[s[right]] == 0:
+    for right, c in enumerate(chars):
+        if count[c] == 0:
             distinct += 1
-        count[s[right]] += 1
+        count[c] += 1
 
         while distinct > k:
-            count[s[left]] -= 1
-            if count[s[left]] == 0:
+            lc = chars[left]
+            count[lc] -= 1
+            if count[lc] == 0:
                 distinct -= 1
             left += 1
 
-        max_length = max(max_length, right - left + 1)
+        if right - left + 1 > max_length:
+            max_length = right - left + 1
     return max_length
 
 
 # 4. Sliding window: longest substring without repeating characters
 def length_of_longest_substring(s):
-    from collections import defaultdict
-    count = defaultdict(int)
     left = 0
     max_length = 0
 
-    for right in range(len(s)):
-        count[s[right]] += 1
-
-        # shrink window if duplicate found
-        while count[s[right]] > 1:
-            count[s[left]] -= 1
-            left += 1
-
-        max_length = max(max_length, right - left + 1)
+    # Remember where each char was last seen, so a duplicate moves left
+    # straight past it instead of shrinking the window one step at a time
+    if isinstance(s, str) and s.isascii():
+        # ASCII fast path: bytes iterate as small ints, so the table is a
+        # flat 128-slot list indexed by code point - no hashing per char
+        last = [-1] * 128
+        for right, c in enumerate(s.encode('ascii')):
+            if last[c] >= left:
+                left = last[c] + 1
+            last[c] = right
+            if right - left + 1 > max_length:
+                max_length = right - left + 1
+        return max_length
+
+    last = {}
+    for right, c in enumerate(s):
+        prev = last.get(c, -1)
+        if prev >= left:
+            left = prev + 1
+        last[c] = right
+        if right - left + 1 > max_length:
+            max_length = right - left + 1
 
     return max_length
 
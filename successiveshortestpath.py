@@ -1,18 +1,236 @@
 import heapq
-from collections import defaultdict, deque
+from array import array
 import math
+from operator import index
+
+# "Unreachable" distance: an int, so distance arithmetic never mixes in
+# floats, and far above any real path cost (paths costing INF or more are
+# treated as unreachable)
+INF = 10**18
+
+# Capacities and costs live in int64 arrays
+INT64_MAX = (1 << 63) - 1
+
+# Edge e's reverse edge is e ^ 1 (add_edge stores them as a pair)
+
+def _spfa(head, next_edge, to, cap, cost, flow, dist, parent, parent_edge,
+          in_queue, queue, source):
+    """
+    SPFA from source over edges with spare capacity. Fills dist, parent and
+    parent_edge in place; dist must start at INF everywhere and in_queue
+    all 0 (it is left that way again when the queue drains).
+    
+    queue is a ring buffer of n + 1 slots: in_queue keeps each node in it at
+    most once, so n + 1 slots never overflow, and it is empty exactly when
+    q_head == q_tail.
+    """
+    size = len(queue)
+    dist[source] = 0
+    
+    # Start our search from the source
+    queue[0] = source
+    q_head, q_tail = 0, 1
+    in_queue[source] = 1
+    
+    while q_head != q_tail:
+        current = queue[q_head]
+        q_head += 1
+        if q_head == size:
+            q_head = 0
+        in_queue[current] = 0
+        
+        # Look at all outgoing routes from current location
+        edge = head[current]
+        while edge != -1:
+            # Can we actually ship anything on this route?
+            # (Is there remaining capacity?)
+            if cap[edge] - flow[edge] > 0:
+                # Would using this route give us a cheaper path to the neighbor?
+                neighbor = to[edge]
+                new_cost = dist[current] + cost[edge]
+                if new_cost < dist[neighbor]:
+                    dist[neighbor] = new_cost
+                    parent[neighbor] = current
+                    parent_edge[neighbor] = edge
+                    
+                    # Add neighbor to queue if it's not already there.
+                    # Smallest Label First: if it already looks cheaper than
+                    # the node at the front, it jumps the queue, so cheap
+                    # labels spread before expensive ones get re-relaxed
+                    if not in_queue[neighbor]:
+                        if q_head != q_tail and new_cost < dist[queue[q_head]]:
+                            q_head = q_head - 1 if q_head else size - 1
+                            queue[q_head] = neighbor
+                        else:
+                            queue[q_tail] = neighbor
+                            q_tail += 1
+                            if q_tail == size:
+                                q_tail = 0
+                        in_queue[neighbor] = 1
+            edge = next_edge[edge]
+
+
+def _dijkstra(head, next_edge, to, cap, cost, flow, pot, dist, parent,
+              parent_edge, source, sink):
+    """
+    Dijkstra from source over edges with spare capacity, measuring each edge
+    by its reduced cost cost[e] + pot[u] - pot[v] (never negative while the
+    potentials are valid). Fills dist, parent and parent_edge in place like
+    _spfa; dist must start at INF everywhere.
+    
+    Stops as soon as sink is settled, so only nodes closer than the sink
+    are guaranteed final; the rest are left at their tentative distance.
+    """
+    heappush, heappop = heapq.heappush, heapq.heappop
+    dist[source] = 0
+    heap = [(0, source)]
+    
+    while heap:
+        d, current = heappop(heap)
+        if d > dist[current]:
+            continue  # Stale entry: current was already settled cheaper
+        if current == sink:
+            break  # Settled: nothing left in the heap can beat it
+        
+        d += pot[current]
+        edge = head[current]
+        while edge != -1:
+            if cap[edge] - flow[edge] > 0:
+                neighbor = to[edge]
+                new_cost = d + cost[edge] - pot[neighbor]
+                if new_cost < dist[neighbor]:
+                    dist[neighbor] = new_cost
+                    parent[neighbor] = current
+                    parent_edge[neighbor] = edge
+                    heappush(heap, (new_cost, neighbor))
+            edge = next_edge[edge]
+
+
+def _push_blocking_flow(head, next_edge, to, cap, cost, flow, pot, current,
+                        blocked, path, source, sink, limit):
+    """
+    Push up to limit units from source to sink using only admissible edges:
+    spare capacity and zero reduced cost, i.e. edges on some cheapest path.
+    Every such path costs the same per unit, so we keep pushing until they
+    are all blocked (Dinic-style) instead of going back for a fresh search
+    after each one.
+    
+    Iterative DFS: current[v] is the next edge of v still worth trying (it
+    must start as a copy of head), and blocked marks nodes on the DFS path
+    or proven dead ends (must start all 0). The DFS path lives in path[:depth]
+    as edge ids; a simple path has fewer than n edges, so n slots are enough.
+    Returns (units pushed, paths).
+    """
+    pushed = 0
+    paths = 0
+    depth = 0
+    node = source
+    blocked[source] = 1
+    
+    while pushed < limit:
+        if node == sink:
+            # Bottleneck of the path, capped by what's still needed. The
+            # first edge that sets it is the first one the push saturates,
+            # so note it now instead of scanning for it afterwards
+            amount = limit - pushed
+            cut = 0
+            for i in range(depth):
+                edge = path[i]
+                if cap[edge] - flow[edge] < amount:
+                    amount = cap[edge] - flow[edge]
+                    cut = i
+            for i in range(depth):
+                edge = path[i]
+                flow[edge] += amount
+                flow[edge ^ 1] -= amount
+            pushed += amount
+            paths += 1
+            if pushed == limit:
+                break
+            
+            # Back up to just before the first saturated edge; everything
+            # after it leaves the path and may be used again
+            for i in range(cut, depth):
+                blocked[to[path[i]]] = 0
+            node = to[path[cut] ^ 1]
+            depth = cut
+            continue
+        
+        # Advance to the next admissible edge out of node
+        edge = current[node]
+        potential = pot[node]
+        while edge != -1:
+            neighbor = to[edge]
+            if (not blocked[neighbor] and cap[edge] - flow[edge] > 0
+                    and cost[edge] + potential - pot[neighbor] == 0):
+                break
+            edge = next_edge[edge]
+        current[node] = edge
+        
+        if edge == -1:
+            # Dead end: it stays blocked for the rest of this round
+            if node == source:
+                break
+            depth -= 1
+            edge = path[depth]
+            node = to[edge ^ 1]
+            current[node] = next_edge[edge]
+        else:
+            path[depth] = edge
+            depth += 1
+            node = to[edge]
+            blocked[node] = 1
+    
+    return pushed, paths
+
 
 class MinCostFlow:
-    def __init__(self):
+    def __init__(self, verbose=False):
         """
         Initialize our minimum cost flow solver.
         Think of this as setting up a logistics company - we need to track
         all our routes, capacities, and costs before we can start shipping.
+        
+        With verbose=True, min_cost_flow narrates every augmenting step.
+        It's off by default: on big networks the printing would cost more
+        than the algorithm itself.
         """
-        # Our network is represented as an adjacency list
-        # Each edge stores: [to_node, capacity, cost, flow, reverse_edge_index]
-        self.graph = defaultdict(list)
+        self.verbose = verbose
+        
+        # Our network is stored as a "forward star": every edge gets an id,
+        # and its fields live in parallel arrays indexed by that id
+        # (to[e], cap[e], cost[e], flow[e]) instead of one small list per
+        # edge. head[v] is the first edge leaving v and next_edge[e] the one
+        # after e (-1 ends the chain), so walking v's routes is a chain of
+        # array reads rather than pointer chasing through lists.
+        # Edges are added in pairs at ids 2k (forward) and 2k + 1 (reverse),
+        # so the partner of edge e is always e ^ 1 - no need to store it.
+        self.head = array('i')
+        self.next_edge = array('i')
+        self.to = array('i')
+        self.cap = array('q')
+        self.cost = array('q')
+        self.flow = array('q')
         self.num_nodes = 0
+        
+        # Node potentials (Johnson-style): once they're set from a first exact
+        # search, every residual edge has reduced cost
+        # cost[e] + pot[u] - pot[v] >= 0, so later searches can use Dijkstra
+        self.pot = array('q')
+        self._have_potentials = False
+        
+        # Scratch buffers for the shortest path search, sized on first use
+        self._dist = array('q')
+        self._parent = array('i')
+        self._parent_edge = array('i')
+        self._in_queue = bytearray()
+        self._queue = array('i')
+        self._no_parent = array('i')
+        self._no_dist = array('q')
+        self._path = array('i')
+        self._current = array('i')
+        self._blocked = bytearray()
+        self._no_blocked = bytes()
     
     def add_edge(self, from_node, to_node, capacity, cost):
         """
@@ -26,18 +244,87 @@ class MinCostFlow:
         
         We also add a reverse edge with 0 capacity - this is like having
         a return route that we might use if we need to "undo" some flow later.
+        
+        Capacity and cost are stored in int64 arrays, so both must be
+        integers that fit in 64 bits (ValueError otherwise). For a route with
+        no real capacity limit, use a large int such as INF rather than
+        float('inf'). Any path costing INF or more counts as unreachable.
         """
+        capacity = self._check_int64(capacity, "capacity")
+        cost = self._check_int64(cost, "cost")
+        
         # Keep track of the highest node number we've seen
         self.num_nodes = max(self.num_nodes, from_node + 1, to_node + 1)
         
-        # Add the forward edge
-        forward_edge = [to_node, capacity, cost, 0, len(self.graph[to_node])]
-        self.graph[from_node].append(forward_edge)
+        # A new edge may have negative reduced cost, so the next search
+        # has to be a full SPFA again
+        self._have_potentials = False
+        if len(self.head) < self.num_nodes:
+            self.head.extend([-1] * (self.num_nodes - len(self.head)))
+        
+        # Add the forward edge (always at an even id)
+        self._append_edge(from_node, to_node, capacity, cost)
         
         # Add the reverse edge (starts with 0 capacity, negative cost)
         # This reverse edge is crucial for the algorithm to work correctly
-        reverse_edge = [from_node, 0, -cost, 0, len(self.graph[from_node]) - 1]
-        self.graph[to_node].append(reverse_edge)
+        self._append_edge(to_node, from_node, 0, -cost)
+    
+    @staticmethod
+    def _check_int64(value, name):
+        """Return value as an int, or raise ValueError if it can't be stored."""
+        try:
+            value = index(value)
+        except TypeError:
+            hint = ""
+            if value == float('inf'):
+                hint = " (use a large int such as INF for an unlimited route)"
+            raise ValueError(f"Edge {name} must be an integer, got {value!r}{hint}") from None
+        if not -INT64_MAX <= value <= INT64_MAX:
+            raise ValueError(f"Edge {name} {value} doesn't fit in 64 bits")
+        return value
+    
+    def _append_edge(self, from_node, to_node, capacity, cost):
+        """Store one directed edge and link it in front of from_node's chain."""
+        edge = len(self.to)
+        self.to.append(to_node)
+        self.cap.append(capacity)
+        self.cost.append(cost)
+        self.flow.append(0)
+        self.next_edge.append(self.head[from_node])
+        self.head[from_node] = edge
+    
+    def _reset_search(self):
+        """
+        Get the search buffers ready: dist at INF, no parents.
+        They're resized only when the network has grown since the last search.
+        """
+        n = self.num_nodes
+        if len(self._parent) != n:
+            # The network grew since the last search: resize the buffers
+            # (potentials restart too; add_edge already invalidated them)
+            self._dist = array('q', [INF]) * n
+            self._parent = array('i', [-1]) * n
+            self._parent_edge = array('i', [-1]) * n
+            self._in_queue = bytearray(n)
+            self._queue = array('i', [0]) * (n + 1)
+            self._no_parent = array('i', [-1]) * n
+            self._no_dist = array('q', [INF]) * n
+            self._path = array('i', [0]) * n
+            self._current = array('i', [-1]) * n
+            self._blocked = bytearray(n)
+            self._no_blocked = bytes(n)
+            self.pot = array('q', [0]) * n
+        
+        # Initialize distances - start with "infinitely expensive" paths
+        dist = self._dist
+        dist[:] = self._no_dist
+        
+        # Keep track of how we got to each node (for path reconstruction):
+        # the previous node and the id of the edge we came in on
+        parent, parent_edge = self._parent, self._parent_edge
+        parent[:] = self._no_parent
+        parent_edge[:] = self._no_parent
+        return dist, parent, parent_edge
     
     def shortest_path_spfa(self, source, sink, supply):
         """
@@ -48,55 +335,103 @@ class MinCostFlow:
         cheaper routes. It's particularly good at handling negative costs
         that can appear in our residual network.
         
+        The search itself runs in _spfa over the raw edge arrays. The
+        dist/parent buffers belong to the solver and are reset and reused on
+        every call, so the returned parent info is only valid until the next
+        search.
+        
         Returns: (distance, parent_info) where parent_info helps us reconstruct the path
         """
-        # Initialize distances - start with "infinitely expensive" paths
-        dist = [float('inf')] * self.num_nodes
-        dist[source] = 0
+        dist, parent, parent_edge = self._reset_search()
         
-        # Keep track of how we got to each node (for path reconstruction)
-        parent = [-1] * self.num_nodes
-        parent_edge = [-1] * self.num_nodes
+        _spfa(self.head, self.next_edge, self.to, self.cap, self.cost, self.flow,
+              dist, parent, parent_edge, self._in_queue, self._queue, source)
         
-        # Track which nodes are currently in our queue (avoid duplicates)
-        in_queue = [False] * self.num_nodes
+        # If we can't reach the sink, there's no path available
+        if dist[sink] == INF:
+            return None, None
         
-        # Start our search from the source
-        queue = deque([source])
-        in_queue[source] = True
+        return dist[sink], (parent, parent_edge)
+    
+    def shortest_path_dijkstra(self, source, sink):
+        """
+        Find the cheapest path from source to sink using Dijkstra's algorithm
+        on reduced costs.
         
-        while queue:
-            current = queue.popleft()
-            in_queue[current] = False
-            
-            # Look at all outgoing routes from current location
-            for edge_idx, edge in enumerate(self.graph[current]):
-                neighbor, capacity, cost, flow, _ = edge
-                
-                # Can we actually ship anything on this route?
-                # (Is there remaining capacity?)
-                remaining_capacity = capacity - flow
-                if remaining_capacity <= 0:
-                    continue
-                
-                # Would using this route give us a cheaper path to the neighbor?
-                new_cost = dist[current] + cost
-                if new_cost < dist[neighbor]:
-                    dist[neighbor] = new_cost
-                    parent[neighbor] = current
-                    parent_edge[neighbor] = edge_idx
-                    
-                    # Add neighbor to queue if it's not already there
-                    if not in_queue[neighbor]:
-                        queue.append(neighbor)
-                        in_queue[neighbor] = True
+        Only valid once the potentials are set (see shortest_path): then no
+        residual edge has negative reduced cost, so the plain heap-based
+        Dijkstra works - O((V+E) log V) instead of SPFA's O(VE) worst case.
+        
+        Returns: (distance, parent_info) like shortest_path_spfa, except the
+        distance is in reduced costs
+        """
+        dist, parent, parent_edge = self._reset_search()
+        
+        _dijkstra(self.head, self.next_edge, self.to, self.cap, self.cost,
+                  self.flow, self.pot, dist, parent, parent_edge, source, sink)
         
         # If we can't reach the sink, there's no path available
-        if dist[sink] == float('inf'):
+        if dist[sink] == INF:
             return None, None
         
         return dist[sink], (parent, parent_edge)
     
+    def shortest_path(self, source, sink):
+        """
+        Find the cheapest path from source to sink and refresh the potentials.
+        
+        The first search (or the first after the network changes) has to be
+        SPFA, since reverse edges have negative costs. Its distances become
+        the potentials, and from then on every search is Dijkstra on reduced
+        costs, adding its distances to the potentials again.
+        
+        After Dijkstra, nodes are moved by min(dist[v], dist[sink]) rather
+        than dist[v]: that still keeps every reduced cost non-negative, and it
+        covers the nodes Dijkstra stopped before settling or never reached.
+        SPFA's real costs can be negative, so there only the unreached nodes
+        get that cap (nothing can ever reach them, so any value will do).
+        
+        Returns: (cost_per_unit, parent_info), with the real (not reduced) cost
+        """
+        if self._have_potentials:
+            distance, path_info = self.shortest_path_dijkstra(source, sink)
+            if path_info is None:
+                return None, None
+            pot = self.pot
+            cost_per_unit = distance + pot[sink] - pot[source]
+        else:
+            distance, path_info = self.shortest_path_spfa(source, sink, 1)
+            if path_info is None:
+                return None, None
+            cost_per_unit = distance
+            # The search may have resized self.pot, so look it up only now
+            self.pot[:] = array('q', [d if d < INF else distance
+                                      for d in self._dist])
+            self._have_potentials = True
+            return cost_per_unit, path_info
+        
+        for v, d in enumerate(self._dist):
+            pot[v] += d if d < distance else distance
+        
+        return cost_per_unit, path_info
+    
+    def push_blocking_flow(self, source, sink, limit):
+        """
+        Ship up to limit units along every currently cheapest path.
+        
+        Call right after shortest_path: its fresh potentials give all the
+        cheapest paths zero reduced cost, and the pushes keep them valid,
+        since every new reverse edge gets zero reduced cost too.
+        
+        Returns: (units pushed, number of paths used)
+        """
+        current, blocked = self._current, self._blocked
+        current[:] = self.head
+        blocked[:] = self._no_blocked
+        return _push_blocking_flow(self.head, self.next_edge, self.to, self.cap,
+                                   self.cost, self.flow, self.pot, current,
+                                   blocked, self._path, source, sink, limit)
+    
     def find_augmenting_path(self, source, sink):
         """
         Find a path where we can push more flow from source to sink.
@@ -104,7 +439,7 @@ class MinCostFlow:
         This is like finding a shipping route where we still have truck capacity
         available. We want the cheapest such route.
         """
-        cost_per_unit, path_info = self.shortest_path_spfa(source, sink, 1)
+        cost_per_unit, path_info = self.shortest_path(source, sink)
         
         if path_info is None:
             return None, None, None
@@ -114,21 +449,20 @@ class MinCostFlow:
         # Reconstruct the path by following parent pointers backwards
         path = []
         current = sink
-        min_capacity = float('inf')
+        min_capacity = INF
         
         # Walk backwards from sink to source
         while parent[current] != -1:
             prev_node = parent[current]
-            edge_idx = parent_edge[current]
             
             # Get the edge we used to reach current node
-            edge = self.graph[prev_node][edge_idx]
-            remaining_capacity = edge[1] - edge[3]  # capacity - flow
+            edge = parent_edge[current]
+            remaining_capacity = self.cap[edge] - self.flow[edge]
             
             # The bottleneck determines how much we can push through this path
             min_capacity = min(min_capacity, remaining_capacity)
             
-            path.append((prev_node, current, edge_idx))
+            path.append((prev_node, current, edge))
             current = prev_node
         
         # Reverse to get path from source to sink
@@ -145,15 +479,13 @@ class MinCostFlow:
         1. Less capacity available on forward edges (trucks are using the route)
         2. More capacity on reverse edges (we could "recall" trucks if needed)
         """
-        for from_node, to_node, edge_idx in path:
+        flow = self.flow
+        for from_node, to_node, edge in path:
             # Update the forward edge (less capacity available)
-            forward_edge = self.graph[from_node][edge_idx]
-            forward_edge[3] += flow_amount  # increase flow
+            flow[edge] += flow_amount  # increase flow
             
             # Update the corresponding reverse edge
-            reverse_edge_idx = forward_edge[4]
-            reverse_edge = self.graph[to_node][reverse_edge_idx]
-            reverse_edge[3] -= flow_amount  # decrease flow (increase available capacity)
+            flow[edge ^ 1] -= flow_amount  # decrease flow (increase available capacity)
     
     def min_cost_flow(self, source, sink, max_flow_needed):
         """
@@ -161,7 +493,8 @@ class MinCostFlow:
         
         The idea is simple but powerful:
         1. Keep finding the cheapest path from source to sink
-        2. Push as much flow as possible through that path
+        2. Push as much flow as possible through that path - and through
+           every other path that's just as cheap, before searching again
         3. Repeat until we've moved all the flow we need
         
         It's like a shipping company that always chooses the cheapest available
@@ -169,41 +502,45 @@ class MinCostFlow:
         """
         total_cost = 0
         total_flow = 0
+        verbose = self.verbose
         
-        print(f"Starting minimum cost flow from node {source} to node {sink}")
-        print(f"We need to ship {max_flow_needed} units total")
+        if verbose:
+            print(f"Starting minimum cost flow from node {source} to node {sink}")
+            print(f"We need to ship {max_flow_needed} units total")
         
         iteration = 1
         
         while total_flow < max_flow_needed:
-            # Find the cheapest path that still has capacity
-            path, flow_capacity, cost_per_unit = self.find_augmenting_path(source, sink)
+            # Find the cheapest cost at which we can still ship anything
+            cost_per_unit, path_info = self.shortest_path(source, sink)
             
-            if path is None:
-                print(f"\nNo more paths available! We could only ship {total_flow} out of {max_flow_needed} units")
+            if path_info is None:
+                if verbose:
+                    print(f"\nNo more paths available! We could only ship {total_flow} out of {max_flow_needed} units")
                 break
             
-            # We can't ship more than what's needed
-            flow_to_push = min(flow_capacity, max_flow_needed - total_flow)
-            
-            print(f"\nIteration {iteration}:")
-            print(f"Found path with capacity {flow_capacity}, cost per unit: {cost_per_unit}")
-            print(f"Shipping {flow_to_push} units along this path")
+            # Ship along all paths of that cost at once (but no more than
+            # what's needed)
+            flow_to_push, num_paths = self.push_blocking_flow(
+                source, sink, max_flow_needed - total_flow)
             
-            # Actually move the flow along this path
-            self.push_flow_along_path(path, flow_to_push)
+            if verbose:
+                print(f"\nIteration {iteration}:")
+                print(f"Found {num_paths} path(s) with cost per unit: {cost_per_unit}")
+                print(f"Shipped {flow_to_push} units along them")
             
             # Update our totals
             path_cost = flow_to_push * cost_per_unit
             total_cost += path_cost
             total_flow += flow_to_push
             
-            print(f"Path cost: {path_cost}, Total cost so far: {total_cost}")
-            print(f"Total flow so far: {total_flow}")
+            if verbose:
+                print(f"Path cost: {path_cost}, Total cost so far: {total_cost}")
+                print(f"Total flow so far: {total_flow}")
             
             iteration += 1
         
-        if total_flow == max_flow_needed:
+        if verbose and total_flow == max_flow_needed:
             print(f"\nSuccess! Shipped all {max_flow_needed} units")
             print(f"Total minimum cost: {total_cost}")
         
@@ -217,11 +554,13 @@ class MinCostFlow:
         print("\nFinal shipping schedule:")
         print("Route (from -> to): Flow/Capacity at Cost per unit")
         
-        for from_node in self.graph:
-            for edge in self.graph[from_node]:
-                to_node, capacity, cost, flow, _ = edge
-                if flow > 0:  # Only show routes that are actually being used
-                    print(f"Route {from_node} -> {to_node}: {flow}/{capacity} at cost {cost} per unit")
+        # Edges come in (forward, reverse) pairs in the order they were added;
+        # a route's origin is where its reverse edge points back to
+        for edge in range(0, len(self.to), 2):
+            flow = self.flow[edge]
+            if flow > 0:  # Only show routes that are actually being used
+                from_node = self.to[edge ^ 1]
+                print(f"Route {from_node} -> {self.to[edge]}: {flow}/{self.cap[edge]} at cost {self.cost[edge]} per unit")
 
 
 # Example usage and testing
@@ -245,7 +584,7 @@ def example_transportation_problem():
     print("TRANSPORTATION PROBLEM EXAMPLE")
     print("="*60)
     
-    mcf = MinCostFlow()
+    mcf = MinCostFlow(verbose=True)
     
     # We'll use a super-source (node 4) and super-sink (node 5)
     # to convert this into a single-source single-sink problem
@@ -287,7 +626,7 @@ def example_simple_network():
     print("SIMPLE NETWORK EXAMPLE")
     print("="*60)
     
-    mcf = MinCostFlow()
+    mcf = MinCostFlow(verbose=True)
     
     # Add edges: from, to, capacity, cost
     mcf.add_edge(0, 3, 5, 10)   # Direct route: expensive but available
@@ -1,37 +1,72 @@
-class TrieNode:
-    def __init__(self):
-        # Each node has children dict and a flag if it's end of word
-        self.children = {}
-        self.is_end = False
+from array import array
+
+# Keys are lowercase English words: each node gets one child slot per letter,
+# so a step down the trie is an array index instead of a dict lookup
+ALPHABET_SIZE = 26
+BASE = ord('a')
+_EMPTY_SLOTS = array('i', [-1]) * ALPHABET_SIZE  # A fresh node's children
+
 
 class Trie:
+    # All nodes live in one arena of flat arrays instead of one object each:
+    # node v's child slots are child[v * 26 : v * 26 + 26] (-1 when absent)
+    # and is_end[v] flags the end of a word. Node 0 is the root, and new
+    # nodes are just appended, so ids are handed out by a bump counter.
+    __slots__ = ('child', 'is_end')
+
     def __init__(self):
-        self.root = TrieNode()
+        self.child = array('i')
+        self.is_end = bytearray()
+        self._new_node()  # Root
+
+    def _new_node(self) -> int:
+        node = len(self.is_end)
+        self.child.extend(_EMPTY_SLOTS)
+        self.is_end.append(0)
+        return node
+
+    # Words are encoded to bytes once up front: iterating bytes yields ints
+    # directly, so the loops below need no per-character ord() call
 
     def insert(self, word: str) -> None:
-        node = self.root
-        for char in word:
+        # Non-ASCII raises UnicodeEncodeError, itself a ValueError
+        key = word.encode('ascii')
+        # Check the whole key before adding any nodes, so a rejected key
+        # leaves no stray prefix behind
+        if key and not (key.isalpha() and key.islower()):
+            bad = next(c for c in key if not 0 <= c - BASE < ALPHABET_SIZE)
+            raise ValueError(f"Trie keys must be lowercase a-z, got {chr(bad)!r}")
+        child = self.child
+        node = 0
+        for c in key:
             # If char not present, add new node
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
-        node.is_end = True
+            slot = node * ALPHABET_SIZE + c - BASE
+            node = child[slot]
+            if node == -1:
+                node = child[slot] = self._new_node()
+        self.is_end[node] = 1
+
+    def _walk(self, word: str) -> int:
+        # Follow word down from the root; -1 if it falls off the trie
+        if not word.isascii():
+            return -1  # Can't be stored, so can't be present either
+        child = self.child
+        node = 0
+        for c in word.encode('ascii'):
+            index = c - BASE
+            if not 0 <= index < ALPHABET_SIZE:
+                return -1
+            node = child[node * ALPHABET_SIZE + index]
+            if node == -1:
+                return -1
+        return node
 
     def search(self, word: str) -> bool:
-        node = self.root
-        for char in word:
-            if char not in node.children:
-                return False
-            node = node.children[char]
-        return node.is_end
+        node = self._walk(word)
+        return node != -1 and self.is_end[node] == 1
 
     def startsWith(self, prefix: str) -> bool:
-        node = self.root
-        for char in prefix:
-            if char not in node.children:
-                return False
-            node = node.children[char]
-        return True
+        return self._walk(prefix) != -1
 
 
 if __name__ == "__main__":
@@ -1,25 +1,63 @@
+from array import array
+
+
+# union_many pushes a whole batch of edges through _uf_union_many in one call
+
+def _uf_find(parent, x):
+    # Path compression: flattens tree for faster future queries
+    # Two passes, no recursion: first walk up to the root, then walk the
+    # same path again pointing every node straight at it
+    root = x
+    while parent[root] != root:
+        root = parent[root]
+    while parent[x] != root:
+        parent[x], x = root, parent[x]
+    return root
+
+
+def _uf_union(parent, rank, a, b):
+    # Union by rank: attach the shallower tree under the deeper one; a rank
+    # only grows when two equal ranks meet
+    # Returns whether a and b were in different sets
+    rootA = _uf_find(parent, a)
+    rootB = _uf_find(parent, b)
+    if rootA == rootB:
+        return False
+    if rank[rootA] < rank[rootB]:
+        rootA, rootB = rootB, rootA
+    parent[rootB] = rootA
+    if rank[rootA] == rank[rootB]:
+        rank[rootA] += 1
+    return True
+
+
+def _uf_union_many(parent, rank, edges):
+    # Union every (a, b) pair in order; returns how many actually merged
+    merged = 0
+    for a, b in edges:
+        if _uf_union(parent, rank, a, b):
+            merged += 1
+    return merged
+
+
 class UnionFind:
     def __init__(self, n):
+        # parent is a flat int32 array
         # parent[i] points to parent of i, or to itself if i is root
-        self.parent = list(range(n))
-        # size[i] tracks size of tree rooted at i (for union by size)
-        self.size = [1] * n
+        self.parent = array('i', range(n))
+        # rank[i] bounds the height of the tree rooted at i (for union by
+        # rank); it never exceeds log2(n), so one byte per node is plenty
+        self.rank = bytearray(n)
 
     def find(self, x):
-        # Path compression: flattens tree for faster future queries
-        if self.parent[x] != x:
-            self.parent[x] = self.find(self.parent[x])
-        return self.parent[x]
+        return _uf_find(self.parent, x)
 
     def union(self, a, b):
-        # Union by size: attach smaller tree under bigger tree
-        rootA = self.find(a)
-        rootB = self.find(b)
-        if rootA != rootB:
-            if self.size[rootA] < self.size[rootB]:
-                rootA, rootB = rootB, rootA
-            self.parent[rootB] = rootA
-            self.size[rootA] += self.size[rootB]
+        return _uf_union(self.parent, self.rank, a, b)
+
+    def union_many(self, edges):
+        # Batch union, e.g. for Kruskal-style sweeps over an edge list
+        return _uf_union_many(self.parent, self.rank, edges)
 
     def connected(self, a, b):
         # Check if two nodes share the same root (are in same set)